@@ -0,0 +1,2 @@
+# Benchmarks for the solver. Run them from the sudoku directory, e.g.:
+#   python -m benchmarks.candidates
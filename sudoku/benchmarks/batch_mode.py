@@ -0,0 +1,48 @@
+# Compares the number of steps and the time taken to solve the examples with one deduction per step (the default)
+# and in batch mode, where each step applies every deduction its strategy finds. Both modes must end with the same
+# grid and max difficulty.
+import time
+
+from examples import examples
+from solver import solve
+
+repeats = 5
+
+
+def box_size_of(rows):
+	return round(len(rows) ** 0.5)
+
+
+def run(rows, batch):
+	best_time = None
+	sudoku = None
+	for _ in range(repeats):
+		start_time = time.perf_counter()
+		sudoku = solve(rows, box_size_of(rows), sudoku=sudoku, record_history=False, batch=batch)
+		elapsed = time.perf_counter() - start_time
+
+		if best_time is None or elapsed < best_time:
+			best_time = elapsed
+
+	grid = sudoku.get_grid_values()
+
+	return best_time, sudoku.total_steps, sudoku.deductions, (grid, sudoku.is_solved, sudoku.max_difficulty)
+
+
+def main():
+	print(f"{'example':>8} {'mode':>9} {'steps':>6} {'deductions':>11} {'time (ms)':>10}")
+
+	for i, rows in enumerate(examples):
+		(one_step_time, one_step_steps, one_step_deductions, one_step_result) = run(rows, False)
+		(batch_time, batch_steps, batch_deductions, batch_result) = run(rows, True)
+
+		if one_step_result != batch_result:
+			raise AssertionError(f"Different results on example {i}.")
+
+		print(f"{i:>8} {'one step':>9} {one_step_steps:>6} {one_step_deductions:>11} {one_step_time * 1000:>10.2f}")
+		print(f"{'':>8} {'batch':>9} {batch_steps:>6} {batch_deductions:>11} {batch_time * 1000:>10.2f} "
+			  f"({one_step_time / batch_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,62 @@
+# Compares the size of puzzles and the time taken to encode and decode them with the binary format
+# (binary_format.py), with pickle and with JSON of their rows. The puzzles are random variations of the 9x9 examples
+# (see benchmarks/bulk.py) and copies of the 16x16 examples. All formats must give back the same puzzles.
+# Usage: python -m benchmarks.binary_format [number of puzzles]
+import json
+import pickle
+import random
+import sys
+import time
+
+from benchmarks.bulk import transformed
+from binary_format import decode_puzzle, encode_puzzle
+from examples import examples
+
+default_count = 20000
+
+
+# Returns the time taken to encode all puzzles, to decode them, the total size and the decoded puzzles.
+def run(puzzles, encode, decode):
+	start_time = time.perf_counter()
+	encoded = [encode(puzzle) for puzzle in puzzles]
+	encode_time = time.perf_counter() - start_time
+
+	start_time = time.perf_counter()
+	decoded = [decode(data) for data in encoded]
+	decode_time = time.perf_counter() - start_time
+
+	return encode_time, decode_time, sum(len(data) for data in encoded), decoded
+
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else default_count
+
+	rng = random.Random(0)
+	for grid_size in (9, 16):
+		box_size = round(grid_size ** 0.5)
+		sources = [rows for rows in examples if len(rows) == grid_size]
+		if grid_size == 9:
+			puzzles = [transformed(sources[i % len(sources)], rng) for i in range(count)]
+		else:
+			puzzles = [[list(row) for row in sources[i % len(sources)]] for i in range(count)]
+
+		values = [bytearray(n for row in rows for n in row) for rows in puzzles]
+
+		formats = {
+			"pickle": run(puzzles, pickle.dumps, pickle.loads),
+			"json": run(puzzles, lambda rows: json.dumps(rows).encode(), json.loads),
+			"binary": run(values, lambda puzzle: encode_puzzle(puzzle, box_size), lambda data: decode_puzzle(data)[0]),
+		}
+
+		if formats["pickle"][3] != puzzles or formats["json"][3] != puzzles or formats["binary"][3] != values:
+			raise AssertionError("A format didn't give back the same puzzles.")
+
+		print(f"{count} {grid_size}x{grid_size} puzzles")
+		print(f"{'format':<8} {'bytes':>6} {'encode (puzzles/s)':>19} {'decode (puzzles/s)':>19}")
+		for name, (encode_time, decode_time, size, _) in formats.items():
+			print(f"{name:<8} {size / count:>6.0f} {count / encode_time:>19.0f} {count / decode_time:>19.0f}")
+		print()
+
+
+if __name__ == "__main__":
+	main()
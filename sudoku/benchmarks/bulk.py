@@ -0,0 +1,69 @@
+# Compares solving many easy and medium 9x9 puzzles by calling solve() in a loop with solve_bulk (bulk.py, needs
+# NumPy). The puzzles are random variations of examples 2 to 4, made by relabelling the digits and shuffling rows,
+# columns, bands and stacks, which doesn't change their difficulty. Both must give the same grids and ratings.
+# Usage: python -m benchmarks.bulk [number of puzzles]
+import random
+import sys
+import time
+
+from bulk import solve_bulk
+from examples import examples
+from solver import solve
+
+box_size = 3
+default_count = 100000
+chunk_size = 10000
+
+
+def shuffled_order(box_size, rng):
+	bands = rng.sample(range(box_size), box_size)
+	return [band * box_size + i for band in bands for i in rng.sample(range(box_size), box_size)]
+
+
+def transformed(rows, rng):
+	grid_size = len(rows)
+	digits = [0] + rng.sample(range(1, grid_size + 1), grid_size)
+	row_order = shuffled_order(box_size, rng)
+	column_order = shuffled_order(box_size, rng)
+
+	new_rows = [[digits[rows[i][j]] for j in column_order] for i in row_order]
+	if rng.random() < 0.5:
+		new_rows = [list(column) for column in zip(*new_rows)]
+
+	return new_rows
+
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else default_count
+
+	rng = random.Random(0)
+	sources = examples[2:5]
+	puzzles = [transformed(sources[i % len(sources)], rng) for i in range(count)]
+
+	start_time = time.perf_counter()
+	sudoku = None
+	loop_results = []
+	for rows in puzzles:
+		sudoku = solve(rows, box_size, sudoku=sudoku, record_history=False)
+		loop_results.append((sudoku.get_grid_values(), sudoku.is_solved, sudoku.total_steps, sudoku.max_difficulty))
+	loop_time = time.perf_counter() - start_time
+
+	start_time = time.perf_counter()
+	bulk_results = []
+	for i in range(0, count, chunk_size):
+		bulk_results += solve_bulk(puzzles[i:i + chunk_size], box_size)
+	bulk_time = time.perf_counter() - start_time
+
+	if [grid for (grid, _, _, _) in loop_results] != [grid for (grid, _, _, _) in bulk_results]:
+		raise AssertionError("solve_bulk found different grids.")
+
+	if [rating for (_, *rating) in loop_results] != [rating for (_, *rating) in bulk_results]:
+		raise AssertionError("solve_bulk gave different steps or difficulties.")
+
+	print(f"{count} puzzles")
+	print(f"solve() in a loop: {loop_time:8.2f} s ({count / loop_time:10.1f} puzzles/s)")
+	print(f"solve_bulk:        {bulk_time:8.2f} s ({count / bulk_time:10.1f} puzzles/s, {loop_time / bulk_time:.1f}x)")
+
+
+if __name__ == "__main__":
+	main()
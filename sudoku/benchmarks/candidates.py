@@ -0,0 +1,63 @@
+# Compares the bitmask candidate engine with the previous approach, where every digit of every square
+# was checked by building the square's row, column and box as new lists.
+import timeit
+
+from bitmasks import *
+from examples import examples
+
+repeats = 20
+
+
+def box_size_of(rows):
+	return round(len(rows) ** 0.5)
+
+
+def could_contain_by_lists(rows, box_size, row_index, column_index, n):
+	row = rows[row_index].copy()
+	column = [row[column_index] for row in rows]
+
+	first_row_index = (row_index // box_size) * box_size
+	first_column_index = (column_index // box_size) * box_size
+	box = [rows[first_row_index + j][first_column_index + k] for j in range(box_size) for k in range(box_size)]
+
+	return n not in row and n not in column and n not in box
+
+
+def candidates_by_lists(rows, box_size):
+	grid_size = box_size ** 2
+
+	candidates = [[set() for _ in range(grid_size)] for _ in range(grid_size)]
+	for i, row in enumerate(rows):
+		for j, square in enumerate(row):
+			if square != 0:
+				continue
+
+			for n in range(1, grid_size + 1):
+				if could_contain_by_lists(rows, box_size, i, j, n):
+					candidates[i][j].add(n)
+
+	return candidates
+
+
+def candidates_by_masks(rows, box_size):
+	return candidates_from_masks(rows, box_size, *unit_masks(rows, box_size))
+
+
+def main():
+	print(f"{'example':>8} {'size':>6} {'lists (ms)':>12} {'masks (ms)':>12} {'speedup':>8}")
+
+	for i, rows in enumerate(examples):
+		box_size = box_size_of(rows)
+
+		if candidates_by_lists(rows, box_size) != candidates_by_masks(rows, box_size):
+			raise AssertionError(f"Candidates differ on example {i}.")
+
+		lists_time = timeit.timeit(lambda: candidates_by_lists(rows, box_size), number=repeats) / repeats
+		masks_time = timeit.timeit(lambda: candidates_by_masks(rows, box_size), number=repeats) / repeats
+
+		size = f"{len(rows)}x{len(rows)}"
+		print(f"{i:>8} {size:>6} {lists_time * 1000:>12.3f} {masks_time * 1000:>12.3f} {lists_time / masks_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+	main()
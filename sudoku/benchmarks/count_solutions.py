@@ -0,0 +1,65 @@
+# Measures how many 9x9 puzzles per second count_solutions (solution_count.py) can check for a unique solution,
+# compared with running the exact cover search (search.py) until it finds two solutions. The puzzles are random
+# variations of the 9x9 examples (see benchmarks/bulk.py), half of them with a few digits removed so that they
+# usually have several solutions. Both must agree on which puzzles are unique.
+# Usage: python -m benchmarks.count_solutions [number of puzzles]
+import random
+import sys
+import time
+
+from benchmarks.bulk import transformed
+from bitmasks import digits_mask
+from examples import examples
+from search import search_solutions
+from solution_count import count_solutions
+from solver import Sudoku
+
+box_size = 3
+default_count = 2000
+
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else default_count
+
+	rng = random.Random(0)
+	sources = [rows for rows in examples if len(rows) == box_size ** 2]
+
+	puzzles = []
+	for i in range(count):
+		rows = transformed(sources[i % len(sources)], rng)
+		if i % 2 == 1:
+			filled = [(r, c) for r in range(box_size ** 2) for c in range(box_size ** 2) if rows[r][c] != 0]
+			for (r, c) in rng.sample(filled, 3):
+				rows[r][c] = 0
+
+		puzzles.append(rows)
+
+	start_time = time.perf_counter()
+	sudoku = None
+	search_unique = []
+	for rows in puzzles:
+		if sudoku is None:
+			sudoku = Sudoku(rows, box_size, record_history=False)
+		else:
+			sudoku.load(rows, box_size)
+
+		masks = [digits_mask(candidates) for row in sudoku.candidates for candidates in row]
+		(solutions, _) = search_solutions(sudoku.values, masks, box_size, limit=2)
+		search_unique.append(len(solutions) == 1)
+	search_time = time.perf_counter() - start_time
+
+	start_time = time.perf_counter()
+	unique = [count_solutions(rows, box_size) == 1 for rows in puzzles]
+	count_time = time.perf_counter() - start_time
+
+	if unique != search_unique:
+		raise AssertionError("count_solutions and the search disagree.")
+
+	print(f"{count} puzzles, {sum(unique)} with a unique solution")
+	print(f"search_solutions(limit=2): {search_time:6.2f} s ({count / search_time:8.1f} puzzles/s)")
+	print(f"count_solutions:           {count_time:6.2f} s ({count / count_time:8.1f} puzzles/s, "
+		  f"{search_time / count_time:.1f}x)")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,90 @@
+# Compares the search for disjoint subsets with the previous approach, which tried every combination of the
+# other empty squares in the sequence as a bitmask. Both searches are run for every square with at least two
+# candidates, in every sequence, using the initial candidates of each example and the candidates left when
+# solving stops. The selected subsets must be identical.
+import time
+
+from bitmasks import digits_mask
+from examples import examples
+from solver import Sudoku, empty_squares, first_disjoint_subset, solve
+
+repeats = 5
+
+
+def box_size_of(rows):
+	return round(len(rows) ** 0.5)
+
+
+def subset_by_enumeration(candidates, pos, other_squares):
+	for mask in range(1, 2 ** len(other_squares)):
+		subset = [pos] + [other_squares[j] for j in range(len(other_squares)) if (1 << j) & mask]
+		candidates_intersection = set.intersection(*[candidates[other_pos[0]][other_pos[1]] for other_pos in subset])
+
+		if len(candidates_intersection) == len(subset):
+			return mask
+
+	return 0
+
+
+def subset_by_pruned_search(mask, other_masks):
+	return first_disjoint_subset(mask, other_masks)
+
+
+# Returns the time taken by the search over all squares of all sequences (best of a few runs), and the subsets found.
+def run(search, sudoku):
+	best_time = None
+	for _ in range(repeats):
+		start_time = time.perf_counter()
+		subsets = []
+
+		for sequence in sudoku.get_all_sequences():
+			positions = empty_squares(sequence)
+
+			# Like the solver, the pruned search gets the candidates of the sequence as bitmasks, computed once.
+			if search is subset_by_pruned_search:
+				masks = [digits_mask(sudoku.candidates[pos[0]][pos[1]]) for pos in positions]
+
+			for i, pos in enumerate(positions):
+				if len(sudoku.candidates[pos[0]][pos[1]]) < 2:
+					continue
+
+				if search is subset_by_pruned_search:
+					subsets.append(search(masks[i], masks[:i] + masks[i+1:]))
+				else:
+					other_squares = positions.copy()
+					other_squares.remove(pos)
+					subsets.append(search(sudoku.candidates, pos, other_squares))
+
+		elapsed = time.perf_counter() - start_time
+
+		if best_time is None or elapsed < best_time:
+			best_time = elapsed
+
+	return best_time, subsets
+
+
+def main():
+	print(f"{'example':>8} {'size':>6} {'state':>8} {'enumeration (ms)':>17} {'pruned (ms)':>12} {'speedup':>8}")
+
+	for i, rows in enumerate(examples):
+		box_size = box_size_of(rows)
+
+		states = [("initial", Sudoku(rows, box_size, record_history=False))]
+		stopped = solve(rows, box_size, record_history=False)
+		if not stopped.is_solved:
+			states.append(("stuck", stopped))
+
+		for (state, sudoku) in states:
+			(enumeration_time, enumeration_subsets) = run(subset_by_enumeration, sudoku)
+			(pruned_time, pruned_subsets) = run(subset_by_pruned_search, sudoku)
+
+			if enumeration_subsets != pruned_subsets:
+				raise AssertionError(f"Different subsets found on example {i} ({state}).")
+
+			size = f"{len(rows)}x{len(rows)}"
+			print(f"{i:>8} {size:>6} {state:>8} {enumeration_time * 1000:>17.2f} {pruned_time * 1000:>12.2f} "
+				  f"{enumeration_time / pruned_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,141 @@
+# Compares remove_candidates_by_elimination with the previous approach, which compared every sequence and digit
+# with every other sequence, using lists of positions. Starting from the initial candidates of each example and
+# the candidates left when solving stops, eliminations are applied until none are left.
+# The explanations and the remaining candidates must be identical.
+import time
+
+from examples import examples
+from solver import Explanation, Sudoku, empty_squares, solve
+
+repeats = 5
+
+
+def box_size_of(rows):
+	return round(len(rows) ** 0.5)
+
+
+def eliminate_by_scan(sudoku):
+	for sequence in sudoku.get_all_sequences():
+		positions = empty_squares(sequence)
+		for n in sudoku.all_possible_numbers:
+			possible_squares = [pos for pos in positions if n in sudoku.candidates[pos[0]][pos[1]]]
+
+			if len(possible_squares) < 2:
+				continue
+
+			for other_sequence in sudoku.get_all_sequences():
+				if other_sequence == sequence:
+					continue
+
+				other_sequence_positions = [square.pos for square in other_sequence]
+
+				if all(pos in other_sequence_positions for pos in possible_squares):
+					eliminations_count = 0
+					affected_squares = []
+
+					for pos in other_sequence_positions:
+						if pos in positions:
+							continue
+
+						if n in sudoku.candidates[pos[0]][pos[1]]:
+							sudoku.candidates[pos[0]][pos[1]].remove(n)
+							affected_squares.append(pos)
+							eliminations_count += 1
+
+					if eliminations_count == 0:
+						continue
+
+					if sudoku.record_history:
+						candidates_shown = []
+						for i, row in enumerate(sudoku.candidates):
+							new_row = []
+							for j, candidates in enumerate(row):
+								if [i, j] in other_sequence_positions:
+									if [i, j] in possible_squares:
+										new_row.append([n])
+									else:
+										new_row.append(list(candidates))
+								else:
+									new_row.append([])
+							candidates_shown.append(new_row)
+
+						red_candidates_shown = []
+						for i, row in enumerate(sudoku.notes["Candidates"]):
+							new_row = []
+							for j, candidates in enumerate(row):
+								new_row.append([n] if [i, j] in affected_squares else [])
+							red_candidates_shown.append(new_row)
+
+						sudoku.explanations.append(Explanation(
+							f"Removed {eliminations_count} candidates from elimination.",
+							affected_sequence=sequence.copy(),
+							candidates=candidates_shown,
+							candidates_red=red_candidates_shown
+						))
+
+					return True
+
+	return False
+
+
+def eliminate_by_index(sudoku):
+	return sudoku.remove_candidates_by_elimination()
+
+
+# Applies eliminations until none are left, starting from the given candidates each time.
+# Returns the best time, the number of eliminations, their explanations and the remaining candidates.
+def run(eliminate, sudoku, candidates, record_history):
+	sudoku.record_history = record_history
+
+	best_time = None
+	for _ in range(repeats if not record_history else 1):
+		sudoku.candidates = [[square_candidates.copy() for square_candidates in row] for row in candidates]
+		sudoku.index_candidates()
+		sudoku.notes["Candidates"] = [[square_candidates.copy() for square_candidates in row] for row in candidates]
+		sudoku.explanations = []
+
+		start_time = time.perf_counter()
+		count = 0
+		while eliminate(sudoku):
+			count += 1
+		elapsed = time.perf_counter() - start_time
+
+		if best_time is None or elapsed < best_time:
+			best_time = elapsed
+
+	explanations = [(explanation.text, [square.n for square in explanation.affected_sequence],
+					 explanation.candidates, explanation.candidates_red) for explanation in sudoku.explanations]
+
+	return best_time, count, explanations, sudoku.candidates
+
+
+def main():
+	print(f"{'example':>8} {'size':>6} {'state':>8} {'steps':>6} {'scan (ms)':>10} {'index (ms)':>11} {'speedup':>8}")
+
+	for i, rows in enumerate(examples):
+		box_size = box_size_of(rows)
+
+		states = [("initial", Sudoku(rows, box_size))]
+		stopped = solve(rows, box_size)
+		if not stopped.is_solved:
+			states.append(("stuck", stopped))
+
+		for (state, sudoku) in states:
+			candidates = [[square_candidates.copy() for square_candidates in row] for row in sudoku.candidates]
+
+			(scan_time, scan_count, _, _) = run(eliminate_by_scan, sudoku, candidates, False)
+			(index_time, index_count, _, _) = run(eliminate_by_index, sudoku, candidates, False)
+
+			(_, _, scan_explanations, scan_candidates) = run(eliminate_by_scan, sudoku, candidates, True)
+			(_, _, index_explanations, index_candidates) = run(eliminate_by_index, sudoku, candidates, True)
+
+			if scan_count != index_count or scan_explanations != index_explanations or scan_candidates != index_candidates:
+				raise AssertionError(f"Different eliminations on example {i} ({state}).")
+
+			size = f"{len(rows)}x{len(rows)}"
+			print(f"{i:>8} {size:>6} {state:>8} {index_count:>6} {scan_time * 1000:>10.2f} {index_time * 1000:>11.2f} "
+				  f"{scan_time / index_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+	main()
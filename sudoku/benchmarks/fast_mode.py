@@ -0,0 +1,53 @@
+# Compares solves per second on the examples between the step-by-step mode used by the GUI, with the grid
+# logged after each step (as it used to be printed), and the fast mode used by solve() with logging disabled.
+import logging
+import os
+import time
+
+from examples import examples
+from solver import Sudoku, logger, solve
+
+repeats = 5
+
+
+def box_size_of(rows):
+	return round(len(rows) ** 0.5)
+
+
+def solve_step_by_step(rows, box_size):
+	sudoku = Sudoku(rows, box_size)
+	sudoku.pause_between_steps = False
+	sudoku.update_gui = False
+	sudoku.start_solve()
+
+	return sudoku
+
+
+def solves_per_second(solve_function):
+	start_time = time.perf_counter()
+	for _ in range(repeats):
+		for rows in examples:
+			solve_function(rows, box_size_of(rows))
+
+	return repeats * len(examples) / (time.perf_counter() - start_time)
+
+
+def main():
+	with open(os.devnull, "w") as devnull:
+		handler = logging.StreamHandler(devnull)
+		logger.addHandler(handler)
+		logger.setLevel(logging.DEBUG)
+
+		step_by_step = solves_per_second(solve_step_by_step)
+
+		logger.removeHandler(handler)
+		logger.setLevel(logging.WARNING)
+
+	fast = solves_per_second(solve)
+
+	print(f"step by step, logging each grid: {step_by_step:8.2f} solves/s")
+	print(f"fast mode, logging disabled:     {fast:8.2f} solves/s ({fast / step_by_step:.2f}x)")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,80 @@
+# Compares the memory used by the grid of one puzzle, and the time taken to copy it, between the previous
+# representation (a list of rows of Square objects, each with its own position list) and the flat bytearray of
+# values now used by Sudoku, at 9x9, 16x16 and 25x25.
+import time
+import tracemalloc
+
+from solver import Square, Sudoku
+
+box_sizes = [3, 4, 5]
+copies = 1000
+
+
+# Returns a valid grid with about half of the squares empty.
+def puzzle_rows(box_size):
+	grid_size = box_size ** 2
+	rows = []
+	for i in range(grid_size):
+		row = []
+		for j in range(grid_size):
+			n = (i * box_size + i // box_size + j) % grid_size + 1
+			row.append(n if (i + j) % 2 == 0 else 0)
+		rows.append(row)
+
+	return rows
+
+
+def square_grid(rows):
+	return [[Square([i, j], n) for j, n in enumerate(row)] for i, row in enumerate(rows)]
+
+
+def copy_square_grid(grid):
+	return [[Square(list(square.pos), square.n) for square in row] for row in grid]
+
+
+def copy_values(values):
+	return bytearray(values)
+
+
+# Returns the memory allocated by create() that is still used by what it returns.
+def allocated_size(create):
+	tracemalloc.start()
+	before = tracemalloc.get_traced_memory()[0]
+	result = create()
+	size = tracemalloc.get_traced_memory()[0] - before
+	tracemalloc.stop()
+
+	del result
+	return size
+
+
+def copy_time(copy, grid):
+	start_time = time.perf_counter()
+	for _ in range(copies):
+		copy(grid)
+
+	return (time.perf_counter() - start_time) / copies
+
+
+def main():
+	print(f"{'size':>6} {'squares (B)':>12} {'values (B)':>11} {'smaller':>8} "
+		  f"{'squares copy (us)':>18} {'values copy (us)':>17} {'faster':>7}")
+
+	for box_size in box_sizes:
+		rows = puzzle_rows(box_size)
+		values = Sudoku(rows, box_size, record_history=False).values
+
+		squares_size = allocated_size(lambda: square_grid(rows))
+		values_size = allocated_size(lambda: bytearray(n for row in rows for n in row))
+
+		squares_copy_time = copy_time(copy_square_grid, square_grid(rows))
+		values_copy_time = copy_time(copy_values, values)
+
+		size = f"{len(rows)}x{len(rows)}"
+		print(f"{size:>6} {squares_size:>12} {values_size:>11} {squares_size / values_size:>7.0f}x "
+			  f"{squares_copy_time * 1e6:>18.2f} {values_copy_time * 1e6:>17.2f} "
+			  f"{squares_copy_time / values_copy_time:>6.0f}x")
+
+
+if __name__ == "__main__":
+	main()
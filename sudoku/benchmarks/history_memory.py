@@ -0,0 +1,58 @@
+# Measures the peak memory used while solving each example, depending on how the steps are recorded:
+# - full snapshots: a copy of the grid and of all candidates after each step, as the history used to be stored,
+# - deltas: the current history, which only stores what changed after each step,
+# - disabled: no history and no explanations, as in batch mode.
+import tracemalloc
+
+from examples import examples
+from solver import Square, Sudoku, solve
+
+
+def box_size_of(rows):
+	return round(len(rows) ** 0.5)
+
+
+def solve_with_snapshots(rows, box_size):
+	sudoku = Sudoku(rows, box_size)
+	sudoku.pause_between_steps = False
+	sudoku.update_gui = True
+
+	steps = []
+	candidates_history = []
+
+	def take_snapshot():
+		steps.append([[Square(s.pos, s.n) for s in row] for row in sudoku.grid])
+		candidates_history.append([[candidates.copy() for candidates in row] for row in sudoku.candidates])
+
+	sudoku.on_step_done = take_snapshot
+	sudoku.start_solve()
+
+	return sudoku, steps, candidates_history
+
+
+def peak_memory(solve_function, rows):
+	tracemalloc.start()
+	result = solve_function(rows)
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+
+	del result
+	return peak
+
+
+def main():
+	print(f"{'example':>8} {'size':>6} {'snapshots (KiB)':>16} {'deltas (KiB)':>13} {'disabled (KiB)':>15}")
+
+	for i, rows in enumerate(examples):
+		box_size = box_size_of(rows)
+
+		snapshots = peak_memory(lambda rows: solve_with_snapshots(rows, box_size), rows)
+		deltas = peak_memory(lambda rows: solve(rows, box_size), rows)
+		disabled = peak_memory(lambda rows: solve(rows, box_size, record_history=False), rows)
+
+		size = f"{len(rows)}x{len(rows)}"
+		print(f"{i:>8} {size:>6} {snapshots / 1024:>16.1f} {deltas / 1024:>13.1f} {disabled / 1024:>15.1f}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,60 @@
+# Measures the cold import time of the solver module in fresh interpreters, and checks that it doesn't load PyQt5.
+# For comparison, it also measures importing PyQt5 and creating a QApplication, which the GUI needs (if installed).
+import os
+import statistics
+import subprocess
+import sys
+
+repeats = 10
+
+sudoku_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+solver_import = """
+import sys, time
+start_time = time.perf_counter()
+import solver
+print(time.perf_counter() - start_time, 'PyQt5' in sys.modules)
+"""
+
+gui_import = """
+import time
+start_time = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+app = QApplication(['-platform', 'offscreen'])
+print(time.perf_counter() - start_time, True)
+"""
+
+
+# Returns the import times measured in each fresh interpreter, and whether PyQt5 was loaded.
+def measure(code):
+	times = []
+	loaded_pyqt = False
+	for _ in range(repeats):
+		result = subprocess.run([sys.executable, "-c", code], cwd=sudoku_directory, capture_output=True, text=True)
+		if result.returncode != 0:
+			return None, None
+
+		[elapsed, pyqt_in_modules] = result.stdout.split()
+		times.append(float(elapsed))
+		loaded_pyqt = loaded_pyqt or pyqt_in_modules == "True"
+
+	return times, loaded_pyqt
+
+
+def main():
+	(solver_times, solver_loaded_pyqt) = measure(solver_import)
+	print(f"import solver: {statistics.median(solver_times) * 1000:.2f} ms (median of {repeats})")
+	print(f"PyQt5 loaded by the solver: {'yes' if solver_loaded_pyqt else 'no'}")
+
+	(gui_times, _) = measure(gui_import)
+	if gui_times is None:
+		print("PyQt5 + QApplication: PyQt5 is not installed.")
+	else:
+		print(f"PyQt5 + QApplication: {statistics.median(gui_times) * 1000:.2f} ms (median of {repeats})")
+
+	if solver_loaded_pyqt:
+		raise AssertionError("Importing the solver loaded PyQt5.")
+
+
+if __name__ == "__main__":
+	main()
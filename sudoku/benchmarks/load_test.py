@@ -0,0 +1,129 @@
+# Sends many /solve requests to the solving service (server.py) from concurrent connections, and reports the
+# throughput and the p50/p99 latency. Refused requests (503) are counted separately and not retried.
+# Either start the server first, or pass --start-server to run one for the duration of the test.
+# Usage: python -m benchmarks.load_test [--requests 2000] [--concurrency 32] [--puzzles puzzles.txt] [--start-server]
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+
+from examples import examples
+from puzzle_format import format_puzzle
+
+
+def percentile(sorted_values, fraction):
+	if len(sorted_values) == 0:
+		return 0
+
+	return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def post(reader, writer, host, body):
+	writer.write((f"POST /solve HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+				  f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+	await writer.drain()
+
+	status = int((await reader.readline()).split()[1])
+
+	length = 0
+	while True:
+		line = await reader.readline()
+		if line in (b"\r\n", b"\n", b""):
+			break
+
+		(name, _, value) = line.decode("latin-1").partition(":")
+		if name.strip().lower() == "content-length":
+			length = int(value)
+
+	await reader.readexactly(length)
+
+	return status
+
+
+# Sends requests one after the other on a single connection, until all requests have been sent.
+async def client(host, port, bodies, counter, latencies, statuses):
+	(reader, writer) = await asyncio.open_connection(host, port)
+	try:
+		while counter[0] < len(bodies):
+			body = bodies[counter[0]]
+			counter[0] += 1
+
+			start_time = time.perf_counter()
+			status = await post(reader, writer, host, body)
+
+			if status == 200:
+				latencies.append(time.perf_counter() - start_time)
+			statuses[status] = statuses.get(status, 0) + 1
+	finally:
+		writer.close()
+
+
+async def run(host, port, bodies, concurrency):
+	counter = [0]
+	latencies = []
+	statuses = {}
+
+	start_time = time.perf_counter()
+	await asyncio.gather(*[client(host, port, bodies, counter, latencies, statuses) for _ in range(concurrency)])
+	elapsed = time.perf_counter() - start_time
+
+	return elapsed, sorted(latencies), statuses
+
+
+async def wait_for_server(host, port, timeout=30):
+	deadline = time.perf_counter() + timeout
+	while True:
+		try:
+			(_, writer) = await asyncio.open_connection(host, port)
+			writer.close()
+			return
+		except OSError:
+			if time.perf_counter() > deadline:
+				raise
+
+			await asyncio.sleep(0.1)
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Load test the solving service.")
+	parser.add_argument("--host", default="127.0.0.1")
+	parser.add_argument("--port", type=int, default=8080)
+	parser.add_argument("--requests", type=int, default=2000, help="total number of requests")
+	parser.add_argument("--concurrency", type=int, default=32, help="number of concurrent connections")
+	parser.add_argument("--puzzles", help="file with one puzzle per line (default: the 9x9 examples)")
+	parser.add_argument("--start-server", action="store_true", help="start server.py for the duration of the test")
+	args = parser.parse_args()
+
+	if args.puzzles:
+		with open(args.puzzles) as file:
+			puzzles = [line.strip() for line in file if line.strip() != "" and not line.startswith("#")]
+	else:
+		puzzles = [format_puzzle(rows) for rows in examples if len(rows) == 9]
+
+	bodies = [json.dumps({"puzzle": puzzles[i % len(puzzles)]}).encode() for i in range(args.requests)]
+
+	server = None
+	if args.start_server:
+		server = subprocess.Popen([sys.executable, "server.py", "--host", args.host, "--port", str(args.port)])
+
+	try:
+		if server is not None:
+			asyncio.run(wait_for_server(args.host, args.port))
+
+		(elapsed, latencies, statuses) = asyncio.run(run(args.host, args.port, bodies, args.concurrency))
+	finally:
+		if server is not None:
+			server.terminate()
+			server.wait()
+
+	print(f"{args.requests} requests from {args.concurrency} connections in {elapsed:.2f} s "
+		  f"({args.requests / elapsed:.1f} requests/s).")
+	print(f"Statuses: {', '.join(f'{status}: {count}' for status, count in sorted(statuses.items()))}")
+	print(f"Latency of solved requests: p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+		  f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms, max {latencies[-1] * 1000 if latencies else 0:.1f} ms.")
+
+
+if __name__ == "__main__":
+	main()
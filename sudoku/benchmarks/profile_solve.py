@@ -0,0 +1,34 @@
+# Profiles solving all examples in fast mode, and prints the functions where the most time is spent.
+# Usage: python -m benchmarks.profile_solve [number of functions to show] [sort key, such as tottime or calls]
+import cProfile
+import pstats
+import sys
+
+from examples import examples
+from solver import solve
+
+repeats = 3
+
+
+def box_size_of(rows):
+	return round(len(rows) ** 0.5)
+
+
+def solve_examples():
+	for _ in range(repeats):
+		for rows in examples:
+			solve(rows, box_size_of(rows), record_history=False)
+
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+	sort_key = sys.argv[2] if len(sys.argv) > 2 else "tottime"
+
+	profiler = cProfile.Profile()
+	profiler.runcall(solve_examples)
+
+	pstats.Stats(profiler).strip_dirs().sort_stats(sort_key).print_stats(count)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,78 @@
+# Measures how many puzzles per second can be read and parsed from a file, line by line as text with parse_puzzle,
+# and streamed from a memory-mapped file with read_puzzles (puzzle_io.py). The file is made of random variations of
+# the 9x9 examples (see benchmarks/bulk.py) and a few 16x16 puzzles. Both must give the same puzzles.
+# The peak memory allocated while streaming the whole file is also shown, which doesn't grow with the file.
+# Usage: python -m benchmarks.puzzle_io [number of puzzles]
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bulk import transformed
+from examples import examples
+from puzzle_format import format_puzzle, parse_puzzle
+from puzzle_io import read_puzzle_lines, read_puzzles
+
+default_count = 200000
+
+
+def read_text(path):
+	with open(path) as file:
+		for line in file:
+			if line.strip() != "" and not line.startswith("#"):
+				yield parse_puzzle(line)
+
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else default_count
+
+	rng = random.Random(0)
+	sources = [rows for rows in examples if len(rows) == 9]
+	lines = [format_puzzle(transformed(sources[i % len(sources)], rng)) for i in range(1000)]
+	lines += [format_puzzle(rows) for rows in examples if len(rows) == 16]
+
+	(handle, path) = tempfile.mkstemp(suffix=".txt")
+	try:
+		with os.fdopen(handle, "w") as file:
+			for i in range(count):
+				file.write(lines[i % len(lines)] + "\n")
+
+		print(f"{count} puzzles, {os.path.getsize(path) / 1e6:.1f} MB")
+
+		start_time = time.perf_counter()
+		line_count = sum(1 for _ in read_puzzle_lines(path))
+		lines_time = time.perf_counter() - start_time
+
+		start_time = time.perf_counter()
+		for _ in read_text(path):
+			pass
+		text_time = time.perf_counter() - start_time
+
+		start_time = time.perf_counter()
+		for _ in read_puzzles(path):
+			pass
+		stream_time = time.perf_counter() - start_time
+
+		if line_count != count or any(puzzle != text_puzzle for (puzzle, text_puzzle) in
+									  zip(read_puzzles(path), read_text(path))):
+			raise AssertionError("read_puzzles and parse_puzzle gave different puzzles.")
+
+		tracemalloc.start()
+		for _ in read_puzzles(path):
+			pass
+		(_, peak) = tracemalloc.get_traced_memory()
+		tracemalloc.stop()
+
+		print(f"text lines + parse_puzzle: {text_time:6.2f} s ({count / text_time:9.0f} puzzles/s)")
+		print(f"read_puzzles (mmap):       {stream_time:6.2f} s ({count / stream_time:9.0f} puzzles/s, "
+			  f"{text_time / stream_time:.1f}x)")
+		print(f"read_puzzle_lines only:    {lines_time:6.2f} s ({count / lines_time:9.0f} lines/s)")
+		print(f"peak memory while streaming: {peak / 1024:.0f} KB")
+	finally:
+		os.remove(path)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,74 @@
+# Compares solving a workload with many repeated and equivalent puzzles with solve() in a loop and with a
+# ResultCache (cache.py). The workload draws puzzles from a pool of different puzzles, made by adding a few digits of
+# the solution to the 9x9 examples, and sends them again either as they are or transformed (see canonical.py), so
+# only the pool needs solving.
+# Usage: python -m benchmarks.result_cache [number of puzzles] [pool size]
+import random
+import sys
+import time
+
+from benchmarks.bulk import transformed
+from cache import ResultCache
+from examples import examples
+from solver import solve
+
+box_size = 3
+default_count = 2000
+default_pool_size = 100
+
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else default_count
+	pool_size = int(sys.argv[2]) if len(sys.argv) > 2 else default_pool_size
+
+	rng = random.Random(0)
+	sources = [rows for rows in examples if len(rows) == box_size ** 2]
+	solutions = [solve(rows, box_size, use_search=True, record_history=False).get_grid_values() for rows in sources]
+
+	pool = []
+	for i in range(pool_size):
+		rows = [list(row) for row in sources[i % len(sources)]]
+		solution = solutions[i % len(sources)]
+		for _ in range(i // len(sources)):
+			(row, column) = rng.choice([(r, c) for r in range(box_size ** 2) for c in range(box_size ** 2) if rows[r][c] == 0])
+			rows[row][column] = solution[row][column]
+
+		pool.append(transformed(rows, rng))
+
+	puzzles = []
+	for _ in range(count):
+		rows = rng.choice(pool)
+		puzzles.append(rows if rng.random() < 0.5 else transformed(rows, rng))
+
+	start_time = time.perf_counter()
+	sudoku = None
+	for rows in puzzles:
+		sudoku = solve(rows, box_size, use_search=True, sudoku=sudoku, record_history=False)
+	loop_time = time.perf_counter() - start_time
+
+	cache = ResultCache(max_size=pool_size)
+	start_time = time.perf_counter()
+	for rows in puzzles:
+		(grid, is_solved, _, _) = cache.solve(rows, box_size, use_search=True)
+
+		if not is_solved or any(rows[i][j] not in (0, grid[i][j]) for i in range(box_size ** 2)
+								for j in range(box_size ** 2)):
+			raise AssertionError("The cache returned a wrong solution.")
+	cache_time = time.perf_counter() - start_time
+
+	# With half the pool fitting in the cache, results keep being evicted.
+	small_cache = ResultCache(max_size=pool_size // 2)
+	start_time = time.perf_counter()
+	for rows in puzzles:
+		small_cache.solve(rows, box_size, use_search=True)
+	small_cache_time = time.perf_counter() - start_time
+
+	print(f"{count} puzzles from a pool of {pool_size}")
+	print(f"solve() in a loop:       {loop_time:7.2f} s")
+	print(f"ResultCache({pool_size:>4}):       {cache_time:7.2f} s ({loop_time / cache_time:.1f}x) {cache.get_stats()}")
+	print(f"ResultCache({pool_size // 2:>4}):       {small_cache_time:7.2f} s ({loop_time / small_cache_time:.1f}x) "
+		  f"{small_cache.get_stats()}")
+
+
+if __name__ == "__main__":
+	main()
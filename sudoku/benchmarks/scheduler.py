@@ -0,0 +1,57 @@
+# Compares how many units (or squares, for strategy 3) each strategy checks when solving the examples, with every
+# strategy checking the whole grid on each step, and with only the units that changed being checked again.
+# The steps taken must be identical.
+import time
+
+from examples import examples
+from solver import Sudoku, strategy_count
+
+repeats = 3
+
+
+def box_size_of(rows):
+	return round(len(rows) ** 0.5)
+
+
+def run(rows, schedule_strategies):
+	sudoku = Sudoku(rows, box_size_of(rows), record_history=False)
+	sudoku.fast = True
+	sudoku.schedule_strategies = schedule_strategies
+
+	best_time = None
+	for _ in range(repeats):
+		sudoku.load(rows, box_size_of(rows))
+
+		start_time = time.perf_counter()
+		sudoku.start_solve()
+		elapsed = time.perf_counter() - start_time
+
+		if best_time is None or elapsed < best_time:
+			best_time = elapsed
+
+	grid = sudoku.get_grid_values()
+
+	return best_time, sudoku.scans[1:], (grid, sudoku.total_steps, sudoku.max_difficulty)
+
+
+def main():
+	strategies = " ".join(f"{f'scans {difficulty}':>10}" for difficulty in range(1, strategy_count + 1))
+	print(f"{'example':>8} {'mode':>10} {strategies} {'total':>9} {'time (ms)':>10}")
+
+	for i, rows in enumerate(examples):
+		(full_time, full_scans, full_result) = run(rows, False)
+		(scheduled_time, scheduled_scans, scheduled_result) = run(rows, True)
+
+		if full_result != scheduled_result:
+			raise AssertionError(f"Different steps taken on example {i}.")
+
+		for (mode, scans, elapsed) in [("full", full_scans, full_time), ("scheduled", scheduled_scans, scheduled_time)]:
+			counts = " ".join(f"{count:>10}" for count in scans)
+			print(f"{i:>8} {mode:>10} {counts} {sum(scans):>9} {elapsed * 1000:>10.2f}")
+
+		print(f"{'':>8} {'':>10} {sum(full_scans) / sum(scheduled_scans):.1f}x fewer scans, "
+			  f"{full_time / scheduled_time:.1f}x faster")
+
+
+if __name__ == "__main__":
+	main()
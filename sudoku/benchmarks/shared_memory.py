@@ -0,0 +1,83 @@
+# Compares solving easy 9x9 puzzles (random variations of the examples solved without search) in parallel with a
+# process pool, which pickles the rows of each puzzle and result, and with solve_shared (shared_solver.py), which
+# exchanges them through shared memory, for each number of workers. Both must give the same results.
+# The bytes sent between processes for each puzzle are shown too: the pickled rows both ways against two records.
+# Usage: python -m benchmarks.shared_memory [number of puzzles] [numbers of workers, e.g. 1,2,4]
+import os
+import pickle
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.bulk import transformed
+from binary_format import record_size
+from examples import examples
+from shared_solver import result_flags, solve_shared
+from solver import solve
+
+box_size = 3
+default_count = 2000
+chunk_size = 64
+
+# Each process pool worker reuses one Sudoku object.
+worker_sudoku = None
+
+
+def solve_rows(rows):
+	global worker_sudoku
+	worker_sudoku = solve(rows, box_size, sudoku=worker_sudoku, record_history=False)
+
+	return worker_sudoku.get_grid_values(), worker_sudoku.is_solved, worker_sudoku.total_steps, \
+		worker_sudoku.max_difficulty
+
+
+def run_pool(puzzles, workers):
+	with ProcessPoolExecutor(workers) as executor:
+		start_time = time.perf_counter()
+		results = [(b"".join(map(bytes, rows)), is_solved, total_steps, max_difficulty) for
+				   (rows, is_solved, total_steps, max_difficulty) in
+				   executor.map(solve_rows, puzzles, chunksize=chunk_size)]
+
+		return results, time.perf_counter() - start_time
+
+
+def run_shared(puzzles, workers):
+	start_time = time.perf_counter()
+	results = [(bytes(values), is_solved, total_steps, max_difficulty) for
+			   (values, is_solved, total_steps, max_difficulty) in
+			   solve_shared((b"".join(map(bytes, rows)) for rows in puzzles), box_size, workers, chunk_size)]
+
+	return results, time.perf_counter() - start_time
+
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else default_count
+	cpu_count = os.cpu_count()
+	worker_counts = [int(w) for w in sys.argv[2].split(",")] if len(sys.argv) > 2 else \
+		[w for w in (1, 2, 4, 8, 16, 32) if w <= cpu_count]
+
+	sources = [rows for rows in examples if len(rows) == box_size ** 2 and
+			   solve(rows, box_size, record_history=False).is_solved]
+	rng = random.Random(0)
+	puzzles = [transformed(sources[i % len(sources)], rng) for i in range(count)]
+
+	(first_result, _, _, _) = solve_rows(puzzles[0])
+	pickled_size = len(pickle.dumps(puzzles[0])) + len(pickle.dumps(first_result))
+	shared_size = record_size(box_size) + record_size(box_size, result_flags)
+	print(f"{count} puzzles, {cpu_count} cores, bytes per puzzle: {pickled_size} pickled, {shared_size} shared")
+
+	print(f"{'workers':>7}  {'process pool':>14}  {'shared memory':>14}")
+	for workers in worker_counts:
+		(pool_results, pool_time) = run_pool(puzzles, workers)
+		(shared_results, shared_time) = run_shared(puzzles, workers)
+
+		if pool_results != shared_results:
+			raise AssertionError("solve_shared gave different results.")
+
+		print(f"{workers:>7}  {count / pool_time:10.0f} /s  {count / shared_time:10.0f} /s "
+			  f"({pool_time / shared_time:.2f}x)")
+
+
+if __name__ == "__main__":
+	main()
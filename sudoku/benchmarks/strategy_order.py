@@ -0,0 +1,69 @@
+# Shows what each strategy does while solving random variations of the 9x9 examples (see benchmarks/bulk.py), from
+# Sudoku.strategy_stats, then compares the time taken with other orders of the strategies. The solver stops at the
+# first strategy that finds something on each step, so trying cheap strategies that often succeed first can be faster,
+# but the steps and their difficulties may change.
+# Usage: python -m benchmarks.strategy_order [number of puzzles]
+import random
+import sys
+import time
+
+from benchmarks.bulk import transformed
+from examples import examples
+from solver import Sudoku, StrategyStats, strategies
+
+box_size = 3
+default_count = 300
+
+default_order = list(strategies)
+
+orders = {
+	"default": default_order,
+	"naked singles first": ["fill_squares_with_one_candidate", "fill_single_empty_squares",
+							"fill_single_possible_squares"] + default_order[3:],
+	"subsets before groups": default_order[:4] + ["create_disjoint_subsets", "create_groups_with_same_candidates"] +
+							 default_order[6:],
+}
+
+
+# Solves all puzzles with the given order of the strategies, and returns the time taken and the total stats.
+def run(puzzles, order):
+	sudoku = Sudoku(puzzles[0], box_size, record_history=False)
+	sudoku.fast = True
+	sudoku.use_search = True
+	sudoku.set_strategy_order(order)
+
+	totals = {name: StrategyStats() for name in order}
+	start_time = time.perf_counter()
+	for rows in puzzles:
+		sudoku.load(rows, box_size)
+		sudoku.start_solve()
+
+		for name, stats in sudoku.strategy_stats.items():
+			totals[name].add(stats)
+
+	return time.perf_counter() - start_time, totals
+
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else default_count
+
+	rng = random.Random(0)
+	sources = [rows for rows in examples if len(rows) == box_size ** 2]
+	puzzles = [transformed(sources[i % len(sources)], rng) for i in range(count)]
+
+	results = {name: run(puzzles, order) for name, order in orders.items()}
+
+	(_, totals) = results["default"]
+	print(f"{count} puzzles, default order")
+	print(f"{'strategy':<36} {'calls':>8} {'successes':>10} {'eliminations':>13} {'time (ms)':>10}")
+	for name, stats in totals.items():
+		print(f"{name:<36} {stats.calls:>8} {stats.successes:>10} {stats.eliminations:>13} {stats.time * 1000:>10.1f}")
+
+	print()
+	(default_time, _) = results["default"]
+	for name, (elapsed, _) in results.items():
+		print(f"{name:<24} {elapsed:6.2f} s ({default_time / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+	main()
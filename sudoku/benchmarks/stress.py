@@ -0,0 +1,70 @@
+# Solves the examples thousands of times in one process using a small pool of reused Sudoku objects.
+# Fails if any result differs from solving the same puzzle with a fresh object, or if memory keeps growing.
+import gc
+import sys
+import time
+
+from examples import examples
+from solver import Sudoku, solve
+
+iterations = 1000
+pool_size = 4
+
+# The number of allocated memory blocks may grow by at most this much between the first and the last round.
+max_blocks_growth = 1000
+
+
+def box_size_of(rows):
+	return round(len(rows) ** 0.5)
+
+
+def summary(sudoku):
+	return (
+		sudoku.get_grid_values(),
+		sudoku.is_solved, sudoku.solve_failed, sudoku.total_steps, sudoku.max_difficulty,
+		[explanation.text for explanation in sudoku.explanations]
+	)
+
+
+def main():
+	puzzles = [rows for rows in examples if len(rows) <= 9]
+
+	expected = [summary(solve(rows, box_size_of(rows))) for rows in puzzles]
+
+	# Two objects that exist at the same time must not affect each other.
+	first = Sudoku(puzzles[0], box_size_of(puzzles[0]))
+	second = Sudoku(puzzles[-1], box_size_of(puzzles[-1]))
+	if first.values is second.values or first.candidates is second.candidates or first.history is second.history:
+		raise AssertionError("Sudoku objects share their state.")
+
+	pool = [Sudoku(puzzles[0], box_size_of(puzzles[0])) for _ in range(pool_size)]
+
+	start_time = time.perf_counter()
+	blocks_after_first_round = 0
+
+	for i in range(iterations):
+		puzzle_index = i % len(puzzles)
+		rows = puzzles[puzzle_index]
+		sudoku = solve(rows, box_size_of(rows), sudoku=pool[i % pool_size])
+
+		if summary(sudoku) != expected[puzzle_index]:
+			raise AssertionError(f"Iteration {i}: result differs from a fresh solve of example {puzzle_index}.")
+
+		if i == len(puzzles) * pool_size - 1:
+			gc.collect()
+			blocks_after_first_round = sys.getallocatedblocks()
+
+	elapsed = time.perf_counter() - start_time
+	gc.collect()
+	blocks_growth = sys.getallocatedblocks() - blocks_after_first_round
+
+	print(f"{iterations} puzzles solved by {pool_size} pooled objects in {elapsed:.2f} s "
+		  f"({iterations / elapsed:.1f} puzzles/s).")
+	print(f"Allocated memory blocks growth after the first round: {blocks_growth}.")
+
+	if blocks_growth > max_blocks_growth:
+		raise AssertionError("Memory keeps growing while reusing the Sudoku objects.")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,219 @@
+# Compact binary format for puzzles and results, used to store them and to pass them between processes.
+# A record is made of:
+# - A header of two bytes: the box size, then flags (see below).
+# - The squares row by row, each on cell_width(box_size) bits, 0 for empty squares, padded to whole bytes. A 9x9
+#   puzzle takes a nibble per square (41 bytes), and a 16x16 puzzle 5 bits per square (160 bytes).
+# - With rating_flag, whether the puzzle was solved (one byte), the total steps (two bytes) and the max difficulty
+#   (one byte), like the results of solve_batch.py.
+# All records with the same box size and flags have the same size, so they can be stored one after the other in a
+# file or in shared memory (see PuzzleArray) and found by index.
+from bitmasks import *
+
+# The squares are those of a solution (or of the grid the solver ended with, see rating_flag).
+solution_flag = 1
+
+# The record ends with the rating of the puzzle.
+rating_flag = 2
+
+header_size = 2
+rating_size = 4
+
+# The high and low nibble of each byte, and each byte shifted to the high nibble, for bytes.translate.
+high_nibbles = bytes(byte >> 4 for byte in range(256))
+low_nibbles = bytes(byte & 15 for byte in range(256))
+to_high_nibbles = bytes((byte << 4) & 255 for byte in range(256))
+
+# The packing plan of each cell width (see packing_plan).
+packing_plans = {}
+
+
+# Returns the number of bits used for each square.
+def cell_width(box_size):
+	return (box_size ** 2).bit_length()
+
+
+# Returns the number of bytes used for the squares.
+def cells_size(box_size):
+	return (box_size ** 4 * cell_width(box_size) + 7) // 8
+
+
+# Returns the number of bytes of a record.
+def record_size(box_size, flags=0):
+	return header_size + cells_size(box_size) + (rating_size if flags & rating_flag else 0)
+
+
+# Every 8 squares take `width` bytes, and each square sits at the same bits of those bytes in every group of 8.
+# The squares are packed and unpacked a whole column of groups at a time: values[j::8] holds square j of each group,
+# and data[k::width] byte k of each group. Returns, for each part of a square that falls in one byte, the square j,
+# the byte k, and the translate tables that move the part from the square to its place in the byte and back.
+def packing_plan(width):
+	if width not in packing_plans:
+		plan = []
+		for j in range(8):
+			# The bits of the square in the group, counted from the first bit of the group.
+			square_start = j * width
+			square_end = square_start + width
+
+			for k in range(square_start // 8, (square_end - 1) // 8 + 1):
+				part_start = max(square_start, k * 8)
+				part_end = min(square_end, k * 8 + 8)
+
+				part_mask = full_mask(part_end - part_start)
+				square_shift = square_end - part_end
+				byte_shift = k * 8 + 8 - part_end
+
+				to_byte = bytes((((n >> square_shift) & part_mask) << byte_shift) & 255 for n in range(256))
+				to_square = bytes((((byte >> byte_shift) & part_mask) << square_shift) & 255 for byte in range(256))
+				plan.append((j, k, to_byte, to_square))
+
+		packing_plans[width] = plan
+
+	return packing_plans[width]
+
+
+# Returns the squares packed on cell_width(box_size) bits each.
+# values: the number in each square indexed by row * grid_size + column, as bytes or a bytearray (like Sudoku.values).
+# The parts of the squares that share a byte have no bits in common, so they are combined as big integers with one
+# byte per group.
+def pack_values(values, box_size):
+	width = cell_width(box_size)
+
+	# With a nibble per square, which is the most common case, each byte holds two whole squares.
+	if width == 4:
+		size = cells_size(box_size)
+		high = bytes(values[0::2]).translate(to_high_nibbles)
+		low = bytes(values[1::2]).ljust(size, b"\0")
+
+		return (int.from_bytes(high, "big") | int.from_bytes(low, "big")).to_bytes(size, "big")
+
+	group_count = (len(values) + 7) // 8
+	values = bytes(values).ljust(group_count * 8, b"\0")
+
+	parts = [0] * width
+	for (j, k, to_byte, _) in packing_plan(width):
+		parts[k] |= int.from_bytes(values[j::8].translate(to_byte), "big")
+
+	packed = bytearray(group_count * width)
+	for k in range(width):
+		packed[k::width] = parts[k].to_bytes(group_count, "big")
+
+	return bytes(packed[:cells_size(box_size)])
+
+
+# Returns the squares of packed data as a bytearray, which Sudoku.load_values can use as its grid.
+def unpack_values(data, box_size):
+	square_count = box_size ** 4
+	width = cell_width(box_size)
+
+	if width == 4:
+		data = bytes(data)
+		values = bytearray(len(data) * 2)
+		values[0::2] = data.translate(high_nibbles)
+		values[1::2] = data.translate(low_nibbles)
+
+		del values[square_count:]
+		return values
+
+	group_count = (square_count + 7) // 8
+	data = bytes(data).ljust(group_count * width, b"\0")
+
+	parts = [0] * 8
+	for (j, k, _, to_square) in packing_plan(width):
+		parts[j] |= int.from_bytes(data[k::width].translate(to_square), "big")
+
+	values = bytearray(group_count * 8)
+	for j in range(8):
+		values[j::8] = parts[j].to_bytes(group_count, "big")
+
+	del values[square_count:]
+	return values
+
+
+# Writes a record at the offset of a writable buffer, such as a bytearray or the buffer of a SharedMemory.
+# rating: (is_solved, total_steps, max_difficulty), needed with rating_flag.
+def encode_into(buffer, offset, values, box_size, flags=0, rating=None):
+	cells_end = offset + header_size + cells_size(box_size)
+
+	buffer[offset] = box_size
+	buffer[offset + 1] = flags
+	buffer[offset + header_size:cells_end] = pack_values(values, box_size)
+
+	if flags & rating_flag:
+		(is_solved, total_steps, max_difficulty) = rating
+		buffer[cells_end] = 1 if is_solved else 0
+		buffer[cells_end + 1:cells_end + 3] = total_steps.to_bytes(2, "big")
+		buffer[cells_end + 3] = max_difficulty
+
+
+# Returns a record as bytes (see encode_into).
+def encode_puzzle(values, box_size, flags=0, rating=None):
+	record = bytearray(record_size(box_size, flags))
+	encode_into(record, 0, values, box_size, flags, rating)
+
+	return bytes(record)
+
+
+# Reads the record at the offset of a buffer, and returns the squares (see unpack_values), the box size, the flags
+# and the rating (None without rating_flag).
+def decode_puzzle(buffer, offset=0):
+	buffer = memoryview(buffer)
+	box_size = buffer[offset]
+	flags = buffer[offset + 1]
+	cells_end = offset + header_size + cells_size(box_size)
+
+	values = unpack_values(buffer[offset + header_size:cells_end], box_size)
+
+	rating = None
+	if flags & rating_flag:
+		rating = (buffer[cells_end] == 1, int.from_bytes(buffer[cells_end + 1:cells_end + 3], "big"), buffer[cells_end + 3])
+
+	return values, box_size, flags, rating
+
+
+# Records of the same box size and flags stored one after the other in a buffer, read and written by index.
+# With the buffer of a multiprocessing SharedMemory, the processes sharing it can exchange puzzles without pickling
+# them:
+#     memory = SharedMemory(create=True, size=PuzzleArray.buffer_size(count, 3))
+#     puzzles = PuzzleArray(memory.buf, 3)
+#     puzzles[0] = sudoku.values
+class PuzzleArray:
+	box_size = 0
+	flags = 0
+
+	buffer = None
+	record_size = 0
+
+	def __init__(self, buffer, box_size, flags=0):
+		self.buffer = memoryview(buffer)
+		self.box_size = box_size
+		self.flags = flags
+		self.record_size = record_size(box_size, flags)
+
+	# Returns the size of the buffer needed for `count` records.
+	@staticmethod
+	def buffer_size(count, box_size, flags=0):
+		return count * record_size(box_size, flags)
+
+	def __len__(self):
+		return len(self.buffer) // self.record_size
+
+	# Returns the squares of a record as a bytearray (see unpack_values).
+	def __getitem__(self, index):
+		(values, _, _, _) = decode_puzzle(self.buffer, index * self.record_size)
+
+		return values
+
+	def __setitem__(self, index, values):
+		self.write(index, values)
+
+	def write(self, index, values, rating=None):
+		encode_into(self.buffer, index * self.record_size, values, self.box_size, self.flags, rating)
+
+	# Returns the squares and the rating of a record (None without rating_flag).
+	def read(self, index):
+		(values, _, _, rating) = decode_puzzle(self.buffer, index * self.record_size)
+
+		return values, rating
+
+	def release(self):
+		self.buffer.release()
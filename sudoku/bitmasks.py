@@ -0,0 +1,117 @@
+# Helpers for storing sets of digits as integer bitmasks.
+# Digit n is stored in bit (n - 1), so a 9x9 grid uses 9 bits and a 16x16 grid uses 16 bits.
+
+
+def digit_bit(n):
+	return 1 << (n - 1)
+
+
+# Returns a mask with a bit set for every digit from 1 to grid_size.
+def full_mask(grid_size):
+	return (1 << grid_size) - 1
+
+
+# Returns the digits stored in the mask, from lowest to highest.
+def mask_digits(mask):
+	return [index + 1 for index in mask_indices(mask)]
+
+
+# Returns the index of each set bit in the mask, from lowest to highest.
+# This is also used for masks of squares, where bit i stands for the i-th square of a row, column or box.
+def mask_indices(mask):
+	indices = []
+	while mask:
+		lowest_bit = mask & -mask
+		indices.append(lowest_bit.bit_length() - 1)
+		mask ^= lowest_bit
+
+	return indices
+
+
+# Returns how many digits are stored in the mask.
+def mask_size(mask):
+	return bin(mask).count("1")
+
+
+# Returns True if the mask holds exactly one digit, such as the candidates of a naked single.
+def is_single(mask):
+	return mask != 0 and mask & (mask - 1) == 0
+
+
+# Returns the digits that are in exactly one of the masks, and the digits that are in at least one of them.
+# With the candidates of the squares of a unit, the first are the hidden singles of the unit.
+def hidden_digits(masks):
+	once = 0
+	twice = 0
+	for mask in masks:
+		twice |= once & mask
+		once |= mask
+
+	return once & ~twice, once
+
+
+# Returns the position of the only mask containing the bit, or -1 if there are none or several. With the candidates
+# of the squares of a unit, this is the square of a hidden single. Stops at the second mask containing the bit.
+def single_position(masks, bit):
+	position = -1
+	for (k, mask) in enumerate(masks):
+		if mask & bit:
+			if position != -1:
+				return -1
+
+			position = k
+
+	return position
+
+
+# Returns the mask of a collection of digits, such as the candidates of a square.
+def digits_mask(digits):
+	mask = 0
+	for n in digits:
+		mask |= digit_bit(n)
+
+	return mask
+
+
+def box_index(row_index, column_index, box_size):
+	return (row_index // box_size) * box_size + (column_index // box_size)
+
+
+# Returns the masks of digits already placed in each row, column and box.
+# The rows are lists of ints indexed by [row][column], with 0 for empty squares.
+def unit_masks(rows, box_size):
+	grid_size = box_size ** 2
+
+	row_masks = [0] * grid_size
+	column_masks = [0] * grid_size
+	box_masks = [0] * grid_size
+
+	for i, row in enumerate(rows):
+		for j, n in enumerate(row):
+			if n == 0:
+				continue
+
+			bit = digit_bit(n)
+			row_masks[i] |= bit
+			column_masks[j] |= bit
+			box_masks[box_index(i, j, box_size)] |= bit
+
+	return row_masks, column_masks, box_masks
+
+
+# Note: the candidates of each square are stored in order from lowest to highest,
+# and filled squares have no candidates.
+def candidates_from_masks(rows, box_size, row_masks, column_masks, box_masks):
+	grid_size = box_size ** 2
+	all_digits = full_mask(grid_size)
+
+	candidates = [[set() for _ in range(grid_size)] for _ in range(grid_size)]
+	for i, row in enumerate(rows):
+		for j, n in enumerate(row):
+			if n != 0:
+				continue
+
+			used = row_masks[i] | column_masks[j] | box_masks[box_index(i, j, box_size)]
+			candidates[i][j] = set(mask_digits(all_digits & ~used))
+
+	return candidates
@@ -0,0 +1,151 @@
+# Solves many puzzles of the same size at once with NumPy, using the deductions of the first strategies of Sudoku:
+# hidden singles (the only square left for a digit in a row, column or box, like fill_single_empty_squares and
+# fill_single_possible_squares) and naked singles (squares with a single candidate, like
+# fill_squares_with_one_candidate). Each pass applies them to every puzzle at once, and the puzzles that are still
+# unsolved when no more singles are left are finished by Sudoku.
+#
+# The puzzles are stored as an (M, N * N) array of values and an (M, N * N) array of candidate masks
+# (see bitmasks.py), and the rows, columns and boxes are reduced with the index tables of units.py.
+# NumPy is only needed for this module, the rest of the solver doesn't depend on it.
+from functools import lru_cache
+
+import numpy as np
+
+from bitmasks import full_mask
+from solver import solve
+from units import get_units
+
+
+# Returns the squares of each unit as an array of shape (units, N), and the units of each square
+# as an array of shape (N * N, 3).
+@lru_cache(maxsize=None)
+def index_arrays(box_size):
+	units = get_units(box_size)
+
+	unit_indices = np.array(units.all_unit_indices, dtype=np.intp)
+	square_units = np.array([square_units for row in units.square_units for square_units in row], dtype=np.intp)
+
+	return unit_indices, square_units
+
+
+def mask_dtype(grid_size):
+	return np.uint16 if grid_size <= 16 else np.uint32
+
+
+# Returns the number of set bits of each mask.
+def popcount(masks, grid_size):
+	counts = np.zeros(masks.shape, dtype=np.uint8)
+	for digit in range(grid_size):
+		counts += ((masks >> digit) & 1).astype(np.uint8)
+
+	return counts
+
+
+# Applies hidden and naked singles to all puzzles until none are left, updating values in place.
+# values: an (M, N * N) array with the number in each square, 0 for empty squares.
+# Like Sudoku, each pass only uses the easiest of the three strategies that finds something in a puzzle, so the
+# ratings are the same as when solving it with Sudoku: singles are never lost by filling other squares, so a harder
+# strategy is only needed when the easier ones are stuck, whatever the order in which their squares are filled.
+# Returns, for each puzzle, the number of steps (one per square filled like Sudoku, or one per pass with batch, which
+# can be more than Sudoku's batch steps, as a pass doesn't see the squares filled earlier in the same pass), the max
+# difficulty of the strategies used and whether a contradiction was found.
+def propagate(values, box_size, batch=False):
+	grid_size = box_size ** 2
+	(unit_indices, square_units) = index_arrays(box_size)
+	dtype = mask_dtype(grid_size)
+	all_digits = dtype(full_mask(grid_size))
+
+	count = len(values)
+	steps = np.zeros(count, dtype=np.int32)
+	max_difficulty = np.zeros(count, dtype=np.int8)
+	contradiction = np.zeros(count, dtype=bool)
+	active = np.ones(count, dtype=bool)
+
+	while active.any():
+		puzzles = np.flatnonzero(active)
+		puzzle_values = values[puzzles]
+		empty = puzzle_values == 0
+
+		# The digits placed in each unit, and the candidates of each empty square.
+		bits = np.where(empty, 0, np.left_shift(dtype(1), np.maximum(puzzle_values, 1).astype(dtype) - dtype(1))).astype(dtype)
+		unit_used = np.bitwise_or.reduce(bits[:, unit_indices], axis=2)
+		used = np.bitwise_or.reduce(unit_used[:, square_units], axis=2)
+		candidates = np.where(empty, all_digits & ~used, 0).astype(dtype)
+
+		# A puzzle is contradicted if a unit holds the same digit twice, if an empty square has no candidates,
+		# or if a digit can't go anywhere in a unit.
+		filled_count = (~empty)[:, unit_indices].sum(axis=2)
+		unit_candidates = np.bitwise_or.reduce(candidates[:, unit_indices], axis=2)
+		invalid = (popcount(unit_used, grid_size) != filled_count).any(axis=1) | \
+			(empty & (candidates == 0)).any(axis=1) | \
+			((unit_used | unit_candidates) != all_digits).any(axis=1)
+
+		# Hidden singles in units with a single empty square are found by fill_single_empty_squares (difficulty 1),
+		# the others by fill_single_possible_squares (difficulty 2).
+		single_empty_units = empty[:, unit_indices].sum(axis=2) == 1
+
+		single_empty_values = np.zeros_like(puzzle_values)
+		hidden_values = np.zeros_like(puzzle_values)
+		naked_values = np.zeros_like(puzzle_values)
+
+		for digit in range(grid_size):
+			has_digit = ((candidates >> digit) & 1).astype(bool)
+
+			in_unit = has_digit[:, unit_indices]
+			(puzzle, unit) = np.nonzero(in_unit.sum(axis=2) == 1)
+			squares = unit_indices[unit, in_unit[puzzle, unit].argmax(axis=1)]
+			hidden_values[puzzle, squares] = digit + 1
+
+			single_empty = single_empty_units[puzzle, unit]
+			single_empty_values[puzzle[single_empty], squares[single_empty]] = digit + 1
+
+			naked_values[candidates == (1 << digit)] = digit + 1
+
+		has_single_empty = (single_empty_values > 0).any(axis=1)
+		has_hidden = (hidden_values > 0).any(axis=1)
+		has_naked = (naked_values > 0).any(axis=1)
+		new_values = np.where(has_single_empty[:, None], single_empty_values,
+							  np.where(has_hidden[:, None], hidden_values, naked_values))
+		difficulty = np.where(has_single_empty, 1, np.where(has_hidden, 2, 3)).astype(np.int8)
+		progress = (has_hidden | has_naked) & ~invalid
+
+		changed = puzzles[progress]
+		filled = new_values[progress] > 0
+		values[changed] = np.where(filled, new_values[progress], puzzle_values[progress])
+		steps[changed] += 1 if batch else filled.sum(axis=1, dtype=np.int32)
+		max_difficulty[changed] = np.maximum(max_difficulty[changed], difficulty[progress])
+
+		contradiction[puzzles[invalid]] = True
+		active[puzzles[~progress]] = False
+
+	return steps, max_difficulty, contradiction
+
+
+# Solves puzzles of the same box size, given as lists of rows, and returns for each one the final rows, whether
+# it was solved, the total steps and the max difficulty. The puzzles that propagation can't solve are finished by
+# Sudoku from where propagation stopped, or from the start if it found a contradiction.
+def solve_bulk(puzzles, box_size, use_search=False, batch=False):
+	grid_size = box_size ** 2
+
+	values = np.array([[n for row in rows for n in row] for rows in puzzles], dtype=np.uint8).reshape(len(puzzles), grid_size ** 2)
+	(steps, max_difficulty, contradiction) = propagate(values, box_size, batch)
+
+	results = []
+	sudoku = None
+	for i, rows in enumerate(puzzles):
+		puzzle_values = values[i].tolist()
+		propagated_rows = [puzzle_values[j * grid_size:(j + 1) * grid_size] for j in range(grid_size)]
+
+		if 0 not in puzzle_values and not contradiction[i]:
+			results.append((propagated_rows, True, int(steps[i]), int(max_difficulty[i])))
+			continue
+
+		if contradiction[i]:
+			sudoku = solve(rows, box_size, use_search, sudoku, record_history=False, batch=batch)
+			results.append((sudoku.get_grid_values(), sudoku.is_solved, sudoku.total_steps, sudoku.max_difficulty))
+		else:
+			sudoku = solve(propagated_rows, box_size, use_search, sudoku, record_history=False, batch=batch)
+			results.append((sudoku.get_grid_values(), sudoku.is_solved, int(steps[i]) + sudoku.total_steps,
+							max(int(max_difficulty[i]), sudoku.max_difficulty)))
+
+	return results
@@ -0,0 +1,184 @@
+# A cache of solved puzzles, so that puzzles that were already solved, or that are equivalent to one that was
+# (see canonical.py), are answered without solving them again.
+# The results of solved puzzles are stored for the canonical form of each puzzle, and turned back to the orientation
+# and digits of the puzzle they are requested for. The cache keeps the most recently used results in memory, up to
+# max_size, and can also keep every result in an SQLite file, so that they are kept between runs and shared between
+# processes.
+#
+# Only the results of solved puzzles are shared between equivalent puzzles. When the strategies get stuck, where they
+# stop, and so the final grid, the steps and the max difficulty, depend on the orientation of the puzzle, since each
+# strategy checks the grid in a fixed order. Unsolved results are only cached for the exact puzzle, so that turning
+# the cache on never changes them. A solved puzzle gets the result of the first equivalent puzzle that was solved:
+# for the same reason, its total steps can differ from solving it directly, and so can its max difficulty when
+# strategies harder than the singles were needed (for about one in twenty of those puzzles). With search, a puzzle
+# with several solutions can also get any of them.
+import sqlite3
+from collections import OrderedDict
+
+from canonical import CanonicalFormTooSlowError, Transform, canonical_form
+from puzzle_format import format_puzzle
+from solver import solve
+
+# Unsolved results are stored for the puzzle itself with this prefix, so that they are never found for its
+# canonical form.
+unsolved_prefix = "unsolved:"
+
+
+class ResultCache:
+	max_size = 0
+
+	# Maps (puzzle, use_search, batch) to (values, is_solved, total_steps, max_difficulty), where the puzzle is
+	# written as in puzzle_format.py, and values is the final grid of the puzzle as bytes, row by row.
+	# The puzzle is the canonical form for solved puzzles, and the puzzle itself after unsolved_prefix otherwise.
+	results = None
+
+	# Maps each puzzle seen recently, as written in puzzle_format.py, to its canonical form and transformation,
+	# so that repeated puzzles don't need to be put in canonical form again. Holds up to max_size puzzles.
+	canonical_forms = None
+
+	# Optional SQLite database with the same results.
+	database = None
+
+	hits = 0
+	misses = 0
+	evictions = 0
+
+	# Hits that were found in the database but not in memory, also counted in hits.
+	database_hits = 0
+
+	# Puzzles whose canonical form took too long to find, which are only cached as they are.
+	canonical_form_skipped = 0
+
+	# The Sudoku object used to solve the puzzles that aren't in the cache.
+	sudoku = None
+
+	def __init__(self, max_size=10000, path=None):
+		self.max_size = max_size
+		self.results = OrderedDict()
+		self.canonical_forms = OrderedDict()
+
+		if path is not None:
+			self.database = sqlite3.connect(path, timeout=30)
+			self.database.execute(
+				"CREATE TABLE IF NOT EXISTS results (puzzle TEXT, use_search INTEGER, batch INTEGER, "
+				"solution BLOB, solved INTEGER, total_steps INTEGER, max_difficulty INTEGER, "
+				"PRIMARY KEY (puzzle, use_search, batch))")
+			self.database.commit()
+
+	# Returns the final rows, whether the puzzle was solved, the total steps and the max difficulty, like solve().
+	def solve(self, rows, box_size, use_search=False, batch=False):
+		grid_size = box_size ** 2
+		(canonical_puzzle, transform) = self.get_canonical_form(rows, box_size)
+		key = (canonical_puzzle, use_search, batch)
+		unsolved_key = (unsolved_prefix + format_puzzle(rows), use_search, batch)
+
+		# Unsolved results stored for a canonical form by earlier versions are ignored.
+		result = self.get(key)
+		if result is not None and result[1]:
+			self.hits += 1
+
+			(values, is_solved, total_steps, max_difficulty) = result
+			solution = [list(values[i * grid_size:(i + 1) * grid_size]) for i in range(grid_size)]
+
+			return transform.revert(solution), is_solved, total_steps, max_difficulty
+
+		result = self.get(unsolved_key)
+		if result is not None:
+			self.hits += 1
+
+			(values, is_solved, total_steps, max_difficulty) = result
+			solution = [list(values[i * grid_size:(i + 1) * grid_size]) for i in range(grid_size)]
+
+			return solution, is_solved, total_steps, max_difficulty
+
+		self.misses += 1
+
+		self.sudoku = solve(rows, box_size, use_search, self.sudoku, record_history=False, batch=batch)
+		solution = self.sudoku.get_grid_values()
+		result = (self.sudoku.is_solved, self.sudoku.total_steps, self.sudoku.max_difficulty)
+
+		if self.sudoku.is_solved:
+			self.put(key, (bytes(n for row in transform.apply(solution) for n in row),) + result)
+		else:
+			self.put(unsolved_key, (bytes(n for row in solution for n in row),) + result)
+
+		return (solution,) + result
+
+	# Returns the canonical form of the puzzle, as written in puzzle_format.py, and the transformation to it.
+	def get_canonical_form(self, rows, box_size):
+		puzzle = format_puzzle(rows)
+		if puzzle in self.canonical_forms:
+			self.canonical_forms.move_to_end(puzzle)
+			return self.canonical_forms[puzzle]
+
+		try:
+			(canonical_rows, transform) = canonical_form(rows, box_size)
+			canonical = (format_puzzle(canonical_rows), transform)
+		except CanonicalFormTooSlowError:
+			self.canonical_form_skipped += 1
+
+			grid_size = box_size ** 2
+			canonical = (puzzle, Transform(False, list(range(grid_size)), list(range(grid_size)),
+										   list(range(grid_size + 1))))
+
+		self.canonical_forms[puzzle] = canonical
+		if len(self.canonical_forms) > self.max_size:
+			self.canonical_forms.popitem(last=False)
+
+		return canonical
+
+	# Returns the cached result for the key, or None.
+	def get(self, key):
+		if key in self.results:
+			self.results.move_to_end(key)
+			return self.results[key]
+
+		if self.database is None:
+			return None
+
+		row = self.database.execute(
+			"SELECT solution, solved, total_steps, max_difficulty FROM results "
+			"WHERE puzzle = ? AND use_search = ? AND batch = ?", key).fetchone()
+		if row is None:
+			return None
+
+		self.database_hits += 1
+
+		result = (row[0], bool(row[1]), row[2], row[3])
+		self.remember(key, result)
+
+		return result
+
+	def put(self, key, result):
+		self.remember(key, result)
+
+		if self.database is not None:
+			self.database.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", key + result)
+			self.database.commit()
+
+	# Adds the result to the results in memory, dropping the least recently used one if the cache is full.
+	def remember(self, key, result):
+		self.results[key] = result
+		self.results.move_to_end(key)
+
+		if len(self.results) > self.max_size:
+			self.results.popitem(last=False)
+			self.evictions += 1
+
+	def get_stats(self):
+		lookups = self.hits + self.misses
+
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"evictions": self.evictions,
+			"database_hits": self.database_hits,
+			"canonical_form_skipped": self.canonical_form_skipped,
+			"size": len(self.results),
+			"hit_rate": self.hits / lookups if lookups > 0 else 0
+		}
+
+	def close(self):
+		if self.database is not None:
+			self.database.close()
+			self.database = None
@@ -0,0 +1,260 @@
+# Canonical form of puzzles, so that equivalent puzzles can be recognised.
+# Two puzzles are equivalent when one can be turned into the other by relabelling the digits, reordering the rows
+# inside a band (a row of boxes), reordering the bands, doing the same with the columns and stacks, and transposing
+# the grid (rotations and reflections are combinations of these). Equivalent puzzles have the same solutions,
+# up to the same transformation, and need the same strategies.
+#
+# The canonical form is the smallest of all the equivalent puzzles, comparing the squares row by row, after
+# relabelling the digits in order of their first appearance, with empty squares larger than any digit. It is found
+# with a search over the transformations that can give the smallest first row, cutting branches that can't beat the
+# best puzzle found so far. Since empty squares are the largest, the first row is one of the rows with the most
+# digits, which leaves few orders of the columns to try.
+from itertools import permutations
+
+
+# A transformation of a puzzle: the grid is transposed first if `transposed`, then row i of the result is
+# row row_order[i] of the grid, column j is column column_order[j], and each digit n becomes labels[n].
+class Transform:
+	transposed = False
+	row_order = None
+	column_order = None
+	labels = None
+
+	def __init__(self, transposed, row_order, column_order, labels):
+		self.transposed = transposed
+		self.row_order = row_order
+		self.column_order = column_order
+		self.labels = labels
+
+	def apply(self, rows):
+		if self.transposed:
+			rows = [list(column) for column in zip(*rows)]
+
+		return [[self.labels[rows[i][j]] for j in self.column_order] for i in self.row_order]
+
+	# Returns the rows of the original puzzle, given the rows of the transformed one.
+	def revert(self, rows):
+		grid_size = len(rows)
+		digits = [0] * (grid_size + 1)
+		for n, label in enumerate(self.labels):
+			digits[label] = n
+
+		original = [[0] * grid_size for _ in range(grid_size)]
+		for i, row in enumerate(rows):
+			for j, n in enumerate(row):
+				original[self.row_order[i]][self.column_order[j]] = digits[n]
+
+		if self.transposed:
+			original = [list(column) for column in zip(*original)]
+
+		return original
+
+
+# Raised when finding the canonical form would take more than the allowed number of steps. This only happens for
+# puzzles with a lot of symmetry, such as nearly empty grids.
+class CanonicalFormTooSlowError(Exception):
+	pass
+
+
+# Returns where the filled squares (0) and the empty squares (1) of the row are when it is the first row.
+def first_row_pattern(row, box_size):
+	filled_counts = sorted((sum(1 for j in range(s * box_size, (s + 1) * box_size) if row[j] != 0)
+							for s in range(box_size)), reverse=True)
+
+	return tuple(n for count in filled_counts for n in [0] * count + [1] * (box_size - count))
+
+
+# Returns the row with its columns in the given order and relabelled with the current labels, giving the next
+# labels to new digits, along with the labels given to new digits. Empty squares become `empty`, which is larger
+# than all labels.
+def relabelled(row, column_order, labels, next_label, empty):
+	result = []
+	new_labels = {}
+	for j in column_order:
+		n = row[j]
+		if n == 0:
+			result.append(empty)
+		elif labels[n] != 0:
+			result.append(labels[n])
+		else:
+			if n not in new_labels:
+				new_labels[n] = next_label + len(new_labels)
+			result.append(new_labels[n])
+
+	return tuple(result), new_labels
+
+
+class CanonicalSearch:
+	box_size = 0
+	grid_size = 0
+	max_steps = 0
+	steps = 0
+
+	# The best puzzle found so far, as a list of relabelled rows, and its transformation.
+	best_rows = None
+	best = None
+
+	def __init__(self, box_size, max_steps):
+		self.box_size = box_size
+		self.grid_size = box_size ** 2
+		self.max_steps = max_steps
+
+	def count_step(self):
+		self.steps += 1
+		if self.steps > self.max_steps:
+			raise CanonicalFormTooSlowError()
+
+	# Tries the orders of the columns that give the smallest first row when the given row is first, building them
+	# one stack at a time. After relabelling, the row is 1, 2, 3... in its filled squares, so the smallest first row
+	# has its filled squares as early as possible: the stacks with more filled squares come first, and the filled
+	# squares come first in each stack. Stacks with as many filled squares can be in any order, and so can the
+	# filled squares and the empty squares of a stack.
+	def search_columns(self, transposed, grid, first_row, column_order=(), used_stacks=()):
+		if len(used_stacks) == self.box_size:
+			self.search_rows(transposed, grid, first_row, column_order)
+			return
+
+		row = grid[first_row]
+		stack_filled_counts = sorted((sum(1 for n in row[s * self.box_size:(s + 1) * self.box_size] if n != 0)
+									  for s in range(self.box_size)), reverse=True)
+
+		for s in range(self.box_size):
+			stack = range(s * self.box_size, (s + 1) * self.box_size)
+			filled = [j for j in stack if row[j] != 0]
+			if s in used_stacks or len(filled) != stack_filled_counts[len(used_stacks)]:
+				continue
+
+			empty = [j for j in stack if row[j] == 0]
+			for filled_order in permutations(filled):
+				for empty_order in permutations(empty):
+					order = column_order + filled_order + empty_order
+					if self.may_be_smallest(grid, first_row, order):
+						self.search_columns(transposed, grid, first_row, order, used_stacks + (s,))
+
+	# Returns whether a column order starting with the given columns could give a puzzle at least as small as the
+	# best one, by comparing the start of the second row with the best second row. Since the second row comes from
+	# the same band as the first one, this only needs to check the other rows of the band.
+	def may_be_smallest(self, grid, first_row, columns):
+		if self.best_rows is None:
+			return True
+
+		self.count_step()
+
+		# The digits of the first row in these columns get labels 1, 2, 3..., and its other digits get larger labels,
+		# which are not known yet. The smallest they can get is used instead, so that the second row is never
+		# larger than it will be.
+		row = grid[first_row]
+		labels = [0] * (self.grid_size + 1)
+		next_label = 1
+		for j in columns:
+			if row[j] != 0:
+				labels[row[j]] = next_label
+				next_label += 1
+
+		unknown_label = next_label
+		first_row_digit_count = sum(1 for n in row if n != 0)
+		for n in row:
+			if n != 0 and labels[n] == 0:
+				labels[n] = unknown_label
+
+		best = self.best_rows[1][:len(columns)]
+		band = first_row // self.box_size
+		for i in range(band * self.box_size, (band + 1) * self.box_size):
+			if i == first_row:
+				continue
+
+			(second_row, _) = relabelled(grid[i], columns, labels, first_row_digit_count + 1, self.grid_size + 1)
+			if second_row <= best:
+				return True
+
+		return False
+
+	# Tries every order of the rows with the given first row and column order.
+	def search_rows(self, transposed, grid, first_row, column_order):
+		self.count_step()
+
+		labels = [0] * (self.grid_size + 1)
+		(row, new_labels) = relabelled(grid[first_row], column_order, labels, 1, self.grid_size + 1)
+		for n, label in new_labels.items():
+			labels[n] = label
+
+		tight = self.best_rows is not None
+		if tight:
+			if row > self.best_rows[0]:
+				return
+			tight = row == self.best_rows[0]
+
+		self.place_row(transposed, grid, column_order, [first_row], [row], labels, 1 + len(new_labels), tight)
+
+	# Chooses the next row, among the rows that give the smallest relabelled row. When the rows so far are the
+	# same as the best ones (tight), rows that are larger than the best one at this position are skipped.
+	def place_row(self, transposed, grid, column_order, row_order, rows, labels, next_label, tight):
+		self.count_step()
+
+		k = len(row_order)
+		if k == self.grid_size:
+			self.best_rows = list(rows)
+
+			# Digits that aren't in the puzzle get the remaining labels, so that the transformation can be reverted.
+			labels = list(labels)
+			for n in range(1, self.grid_size + 1):
+				if labels[n] == 0:
+					labels[n] = next_label
+					next_label += 1
+
+			self.best = Transform(transposed, list(row_order), list(column_order), labels)
+			return
+
+		# The first row of a band can come from any band not used yet, and the others from the same band.
+		if k % self.box_size == 0:
+			used_bands = set(i // self.box_size for i in row_order)
+			choices = [i for i in range(self.grid_size) if i // self.box_size not in used_bands]
+		else:
+			band = row_order[-1] // self.box_size
+			choices = [i for i in range(band * self.box_size, (band + 1) * self.box_size) if i not in row_order]
+
+		smallest = None
+		candidates = []
+		for i in choices:
+			(row, new_labels) = relabelled(grid[i], column_order, labels, next_label, self.grid_size + 1)
+			if smallest is None or row < smallest:
+				smallest = row
+				candidates = [(i, new_labels)]
+			elif row == smallest:
+				candidates.append((i, new_labels))
+
+		if tight:
+			if smallest > self.best_rows[k]:
+				return
+			tight = smallest == self.best_rows[k]
+
+		for (i, new_labels) in candidates:
+			row_labels = list(labels)
+			for n, label in new_labels.items():
+				row_labels[n] = label
+
+			self.place_row(transposed, grid, column_order, row_order + [i], rows + [smallest], row_labels,
+						   next_label + len(new_labels), tight)
+
+			# A smaller puzzle may have been found, so the next rows are compared with it.
+			tight = tight or self.best_rows[:k + 1] == rows + [smallest]
+
+
+# Returns the canonical form of the puzzle as a list of rows, and the transformation that turns the puzzle into it.
+# Raises CanonicalFormTooSlowError if the search needs more than max_steps steps.
+def canonical_form(rows, box_size, max_steps=20000):
+	search = CanonicalSearch(box_size, max_steps)
+	grids = [(False, rows), (True, [list(column) for column in zip(*rows)])]
+
+	smallest_pattern = min(first_row_pattern(row, box_size) for (_, grid) in grids for row in grid)
+
+	for (transposed, grid) in grids:
+		for i, row in enumerate(grid):
+			if first_row_pattern(row, box_size) != smallest_pattern:
+				continue
+
+			search.search_columns(transposed, grid, i)
+
+	empty = box_size ** 2 + 1
+
+	return [[n if n != empty else 0 for n in row] for row in search.best_rows], search.best
@@ -0,0 +1,78 @@
+examples = [
+	[[4, 1, 2, 0],
+	 [0, 2, 0, 4],
+	 [1, 4, 0, 2],
+	 [2, 3, 4, 1]],
+
+	[[0, 1, 4, 0],
+	 [0, 4, 0, 1],
+	 [0, 3, 0, 2],
+	 [0, 0, 0, 0]],
+
+	[[3, 8, 6, 0, 0, 0, 2, 4, 5],
+	 [0, 2, 0, 3, 5, 6, 8, 0, 0],
+	 [0, 7, 0, 0, 8, 0, 0, 1, 0],
+	 [0, 0, 0, 0, 6, 4, 9, 8, 7],
+	 [0, 4, 0, 7, 3, 0, 0, 6, 0],
+	 [1, 0, 7, 2, 0, 0, 0, 5, 4],
+	 [7, 0, 0, 0, 4, 1, 5, 2, 0],
+	 [0, 0, 2, 5, 7, 0, 4, 0, 8],
+	 [0, 5, 0, 6, 2, 9, 7, 0, 0]],
+
+	[[0, 0, 0, 0, 8, 0, 0, 0, 9],
+	 [0, 0, 0, 0, 0, 1, 6, 2, 0],
+	 [0, 9, 2, 0, 0, 6, 4, 7, 0],
+	 [6, 0, 0, 1, 0, 0, 0, 9, 0],
+	 [4, 5, 0, 0, 3, 0, 0, 6, 1],
+	 [0, 1, 0, 0, 0, 5, 0, 0, 7],
+	 [0, 8, 7, 4, 0, 0, 1, 3, 0],
+	 [0, 2, 6, 8, 0, 0, 0, 0, 0],
+	 [9, 0, 0, 0, 6, 0, 0, 0, 0]],
+
+	[[5, 3, 0, 0, 7, 0, 0, 0, 0],
+	 [6, 0, 0, 1, 9, 5, 0, 0, 0],
+	 [0, 9, 8, 0, 0, 0, 0, 6, 0],
+	 [8, 0, 0, 0, 6, 0, 0, 0, 3],
+	 [4, 0, 0, 8, 0, 3, 0, 0, 1],
+	 [7, 0, 0, 0, 2, 0, 0, 0, 6],
+	 [0, 6, 0, 0, 0, 0, 2, 8, 0],
+	 [0, 0, 0, 4, 1, 9, 0, 0, 5],
+	 [0, 0, 0, 0, 8, 0, 0, 7, 9]],
+
+	[[7, 0, 0, 0, 8, 3, 0, 0, 0],
+	 [9, 0, 2, 0, 0, 5, 0, 0, 0],
+	 [0, 0, 0, 0, 0, 7, 0, 5, 2],
+	 [8, 0, 6, 0, 0, 0, 1, 0, 0],
+	 [4, 0, 0, 8, 0, 1, 0, 0, 7],
+	 [0, 0, 1, 0, 0, 0, 2, 0, 4],
+	 [3, 6, 0, 1, 0, 0, 0, 0, 0],
+	 [0, 0, 0, 3, 0, 0, 8, 0, 6],
+	 [0, 0, 0, 5, 7, 0, 0, 0, 3]],
+
+	[[0, 0, 0, 9, 0, 3, 0, 0, 0],
+	 [0, 0, 5, 4, 0, 8, 1, 0, 0],
+	 [0, 9, 0, 0, 2, 0, 0, 3, 0],
+	 [1, 2, 0, 0, 0, 0, 0, 5, 3],
+	 [0, 0, 0, 0, 0, 0, 0, 0, 0],
+	 [9, 5, 0, 0, 0, 0, 0, 7, 8],
+	 [0, 7, 0, 0, 4, 0, 0, 1, 0],
+	 [0, 0, 9, 6, 0, 1, 3, 0, 0],
+	 [0, 0, 0, 7, 0, 5, 0, 0, 0]],
+
+	[[ 3, 13,  0,  0, 15,  0,  0,  0,  0,  7,  6,  4,  0, 16,  0, 14],
+	 [ 0,  0,  0,  2, 11,  0, 13,  8,  0,  0,  0,  0,  5, 10,  0,  3],
+	 [ 0,  0,  0, 14,  9,  0, 16,  4,  0,  0,  2, 15,  0,  6,  0,  0],
+	 [ 0, 11,  7, 10,  0,  0,  6,  0,  9,  0,  0, 13,  0,  4, 12,  0],
+	 [ 0,  2, 15,  0,  0, 16,  0,  0,  0,  6, 10,  9,  0,  0,  0,  0],
+	 [ 0,  0, 16,  0,  5,  8,  0, 15, 13,  3,  0,  0, 12,  0, 11, 10],
+	 [ 7,  5,  0,  0,  0,  0, 10,  0,  0,  0,  8,  1,  6, 15, 16,  0],
+	 [ 1, 10,  8,  0, 13,  6,  4,  0,  0,  0,  0,  0,  0,  0,  3,  9],
+	 [11, 16,  0,  0,  0,  0,  0,  0,  0, 12,  9,  7,  0,  1, 10, 15],
+	 [ 0,  1, 10, 15,  7, 13,  0,  0,  0,  2,  0,  0,  0,  0,  6, 12],
+	 [ 9,  3,  0,  7,  0,  0, 15,  6,  5,  0, 16,  8,  0, 11,  0,  0],
+	 [ 0,  0,  0,  0,  3, 11,  8,  0,  0,  0, 15,  0,  0,  9,  7,  0],
+	 [ 0,  7,  5,  0,  6,  0,  0, 12,  0,  4,  0,  0,  9,  2, 14,  0],
+	 [ 0,  0,  3,  0,  4, 10,  0,  0, 16,  5,  0,  6,  1,  0,  0,  0],
+	 [ 6,  0, 11, 13,  0,  0,  0,  0,  2,  9,  0, 12, 10,  0,  0,  0],
+	 [12,  0,  4,  0, 16,  9,  7,  0,  0,  0,  0, 10,  0,  0,  5,  6]]
+]
@@ -0,0 +1,281 @@
+# Generates puzzles of a requested difficulty (the max_difficulty of Sudoku) and box size, in parallel.
+# Each puzzle starts as a random full grid. Its digits are then removed one at a time, in random order, keeping each
+# removal only if the puzzle still has a unique solution and isn't harder than the requested difficulty. When no more
+# digits can be removed, the puzzle is kept if it has the requested difficulty, and otherwise another grid is tried.
+#
+# Rating the puzzle after each removal doesn't need a full solve. The strategies only ever fill squares and remove
+# candidates, so if a puzzle has difficulty r, removing a digit gives a puzzle whose difficulty is the larger of r and
+# the hardest strategy needed to fill the removed square again, after which the solve goes on as before. Solving stops
+# as soon as that square is filled (see Sudoku.stop_square), which usually takes a few steps. If the strategies fill it
+# without search, its digit is forced, so the puzzle is still unique and its solutions don't need to be counted.
+# This assumes that giving the solver more digits never makes it need a harder strategy, which is almost always the
+# case but not always (a puzzle the solver only finishes with search can have one digit less and need no search), so
+# the finished puzzle is solved again in full to check its difficulty.
+# Often the square can be filled again right away by a strategy no harder than r, in which case nothing changes and
+# the puzzle isn't solved at all (see direct_difficulty). The strategies harder than the requested difficulty are
+# never tried, so a removal that needs them is rejected as soon as the easier ones are stuck.
+#
+# Most full grids never reach the requested difficulty when it is above 2, so the digging is biased towards it:
+# partially dug grids are kept as snapshots, and the next puzzles are dug again from them instead of from new full
+# grids, with grid_size of the removed digits put back and in another random order. A snapshot is kept when a grid
+# first reaches the requested difficulty, from where most orders end at that difficulty, and when a grid ends below it,
+# since digging it again in another order often gets further. Each snapshot is used snapshot_uses times, and the
+# puzzles dug from the same one are all different.
+#
+# Usage: python generator.py [--count 100] [--difficulty 4] [--box-size 3] [--workers 8] [--seed 0] [-o puzzles.txt]
+import argparse
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from bitmasks import *
+from puzzle_format import format_puzzle
+from puzzle_io import open_output
+from search import search_solutions
+from solution_count import count_solutions
+from solver import Sudoku, search_difficulty, solve
+
+# The number of grids dug for each puzzle before giving up, new full grids or snapshots (see above).
+max_attempts = 1000
+
+# The number of times each snapshot of a partially dug grid is dug again (see above).
+snapshot_uses = 5
+
+
+# Raised when no puzzle of the requested difficulty was found.
+class GenerationError(Exception):
+	pass
+
+
+# Returns a random full grid as a flat list of values, indexed by row * grid_size + column.
+# The boxes on the diagonal don't share any row or column, so they are filled with random digits first,
+# and a search fills the rest.
+def random_full_grid(box_size, rng):
+	grid_size = box_size ** 2
+
+	while True:
+		values = [0] * grid_size ** 2
+		for box in range(box_size):
+			digits = rng.sample(range(1, grid_size + 1), grid_size)
+			for k, n in enumerate(digits):
+				values[(box * box_size + k // box_size) * grid_size + box * box_size + k % box_size] = n
+
+		rows = [values[i * grid_size:(i + 1) * grid_size] for i in range(grid_size)]
+		(row_masks, column_masks, box_masks) = unit_masks(rows, box_size)
+		masks = [0 if rows[i][j] != 0 else
+				 full_mask(grid_size) & ~(row_masks[i] | column_masks[j] | box_masks[box_index(i, j, box_size)])
+				 for i in range(grid_size) for j in range(grid_size)]
+
+		# In 4x4 grids, the diagonal boxes can leave no solution.
+		(solutions, _) = search_solutions(values, masks, box_size)
+		if len(solutions) > 0:
+			return solutions[0]
+
+
+# Returns the difficulty of the puzzle, or None if it can't be solved with the strategies (and search if enabled).
+# With stop_square, only the steps needed to fill that square are taken into account (see above).
+# With difficulty_limit, harder strategies aren't tried, so a puzzle that needs them is rejected (None) as soon as
+# the easier ones are stuck, instead of being solved with them first (see Sudoku.difficulty_limit).
+def rate(sudoku, rows, box_size, use_search, stop_square=None, difficulty_limit=None):
+	sudoku.stop_square = stop_square
+	sudoku.difficulty_limit = difficulty_limit
+	solve(rows, box_size, use_search, sudoku, record_history=False)
+	sudoku.stop_square = None
+	sudoku.difficulty_limit = None
+
+	filled = sudoku.is_solved if stop_square is None else sudoku.values[stop_square] != 0
+
+	return sudoku.max_difficulty if filled else None
+
+
+# Returns the difficulty of the easiest of the first strategies that can fill the empty square [i, j] of the puzzle
+# right away, where n is the digit that goes in it, or None if none of them can: 1 if it's the only empty square of
+# one of its units, 2 if it's the only square of one of them where n could go, and 3 if n is the only digit that could
+# go in it. These stay true until the square is filled, so the solver never needs a harder strategy to fill it.
+def direct_difficulty(rows, i, j, n, box_size):
+	grid_size = box_size ** 2
+	(row_masks, column_masks, box_masks) = unit_masks(rows, box_size)
+	bit = digit_bit(n)
+
+	box_row = i // box_size * box_size
+	box_column = j // box_size * box_size
+	units = [[(i, c) for c in range(grid_size)], [(r, j) for r in range(grid_size)],
+			 [(box_row + k // box_size, box_column + k % box_size) for k in range(grid_size)]]
+
+	if any(all(rows[r][c] != 0 or (r, c) == (i, j) for (r, c) in unit) for unit in units):
+		return 1
+
+	for unit in units:
+		if not any(rows[r][c] == 0 and (r, c) != (i, j) and
+				   not (row_masks[r] | column_masks[c] | box_masks[box_index(r, c, box_size)]) & bit
+				   for (r, c) in unit):
+			return 2
+
+	if row_masks[i] | column_masks[j] | box_masks[box_index(i, j, box_size)] | bit == full_mask(grid_size):
+		return 3
+
+	return None
+
+
+# A partially dug grid to dig again (see above), with the full grid it was dug from and the puzzles dug from it so far.
+class Snapshot:
+	rows = None
+	solution = None
+	uses_left = 0
+	puzzles = None
+
+	def __init__(self, rows, solution):
+		self.rows = [list(row) for row in rows]
+		self.solution = solution
+		self.uses_left = snapshot_uses
+		self.puzzles = set()
+
+
+# Returns the rows of a puzzle with a unique solution and the given difficulty.
+# When incremental is disabled, the puzzle is solved again in full after each removal.
+# snapshots: a list kept between calls to dig puzzles again from partially dug grids (see above), or None to start
+# each attempt from a new full grid.
+def generate_puzzle(box_size, difficulty, rng, sudoku=None, incremental=True, snapshots=None):
+	grid_size = box_size ** 2
+	use_search = difficulty >= search_difficulty
+
+	if sudoku is None:
+		sudoku = Sudoku([[0] * grid_size for _ in range(grid_size)], box_size, record_history=False)
+
+	for _ in range(max_attempts):
+		if snapshots:
+			source = snapshots[-1]
+			source.uses_left -= 1
+			if source.uses_left == 0:
+				snapshots.pop()
+
+			# Some of the removed digits are put back, so that the digging starts from further up and doesn't end
+			# with the same puzzle.
+			values = source.solution
+			rows = [list(row) for row in source.rows]
+			empty_squares = [index for index in range(grid_size ** 2) if rows[index // grid_size][index % grid_size] == 0]
+			for index in rng.sample(empty_squares, min(grid_size, len(empty_squares))):
+				rows[index // grid_size][index % grid_size] = values[index]
+
+			rating = rate(sudoku, rows, box_size, use_search, difficulty_limit=difficulty)
+			if rating is None:
+				continue
+		else:
+			source = None
+			values = random_full_grid(box_size, rng)
+			rows = [values[i * grid_size:(i + 1) * grid_size] for i in range(grid_size)]
+			rating = 0
+
+		for index in rng.sample(range(grid_size ** 2), grid_size ** 2):
+			(i, j) = (index // grid_size, index % grid_size)
+			n = rows[i][j]
+			if n == 0:
+				continue
+
+			rows[i][j] = 0
+
+			if incremental:
+				direct = direct_difficulty(rows, i, j, n, box_size)
+				if direct is not None and direct <= rating:
+					continue
+
+				new_rating = rate(sudoku, rows, box_size, use_search, index, difficulty)
+				if new_rating is not None:
+					new_rating = max(rating, new_rating)
+			else:
+				new_rating = rate(sudoku, rows, box_size, use_search, difficulty_limit=difficulty)
+
+			# Without search, the strategies only make deductions, so a puzzle they can rate has a unique solution.
+			if new_rating is None or new_rating > difficulty or \
+					(new_rating >= search_difficulty and count_solutions(rows, box_size) != 1):
+				rows[i][j] = n
+				continue
+
+			if snapshots is not None and source is None and rating < difficulty and new_rating == difficulty:
+				source = Snapshot(rows, values)
+				snapshots.append(source)
+
+			rating = new_rating
+
+		if rating != difficulty or \
+				(incremental and rate(sudoku, rows, box_size, use_search, difficulty_limit=difficulty) != difficulty):
+			if snapshots is not None and source is None and rating < difficulty:
+				snapshots.append(Snapshot(rows, values))
+			continue
+
+		if source is not None:
+			puzzle = format_puzzle(rows)
+			if puzzle in source.puzzles:
+				continue
+
+			source.puzzles.add(puzzle)
+
+		return rows
+
+	raise GenerationError(f"No {grid_size}x{grid_size} puzzle of difficulty {difficulty} was found "
+						  f"in {max_attempts} attempts.")
+
+
+# Generates puzzles in a worker process. Each chunk has its own seed, so the puzzles only depend on the seed
+# given to generate_puzzles, and not on the number of workers.
+def generate_chunk(count, box_size, difficulty, seed):
+	rng = random.Random(seed)
+	grid_size = box_size ** 2
+	sudoku = Sudoku([[0] * grid_size for _ in range(grid_size)], box_size, record_history=False)
+	snapshots = []
+
+	puzzles = []
+	for _ in range(count):
+		rows = generate_puzzle(box_size, difficulty, rng, sudoku, snapshots=snapshots)
+		puzzles.append(format_puzzle(rows))
+
+	return puzzles
+
+
+# Yields `count` puzzles on a single line each (see puzzle_format.py), generated by the workers in chunks.
+def generate_puzzles(count, box_size, difficulty, workers, chunk_size=10, seed=0):
+	with ProcessPoolExecutor(workers) as executor:
+		pending = deque()
+		for (chunk_index, start) in enumerate(range(0, count, chunk_size)):
+			chunk_seed = f"{seed}:{chunk_index}"
+			pending.append(executor.submit(generate_chunk, min(chunk_size, count - start), box_size, difficulty,
+										   chunk_seed))
+
+			if len(pending) >= 2 * workers:
+				yield from pending.popleft().result()
+
+		while len(pending) > 0:
+			yield from pending.popleft().result()
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Generate puzzles of a given difficulty.")
+	parser.add_argument("--count", type=int, default=100, help="number of puzzles to generate")
+	parser.add_argument("--difficulty", type=int, default=4, choices=range(1, search_difficulty + 1),
+						help=f"max difficulty of the puzzles ({search_difficulty} needs search)")
+	parser.add_argument("--box-size", type=int, default=3, help="box size of the puzzles (3 for 9x9 puzzles)")
+	parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+	parser.add_argument("--chunk-size", type=int, default=10, help="number of puzzles generated by a worker at once")
+	parser.add_argument("--seed", type=int, default=0, help="seed of the random grids")
+	parser.add_argument("-o", "--output", help="file to write the puzzles to (default: standard output)")
+	args = parser.parse_args()
+
+	start_time = time.perf_counter()
+
+	with open_output(args.output) as output:
+		try:
+			for puzzle in generate_puzzles(args.count, args.box_size, args.difficulty, args.workers, args.chunk_size,
+										   args.seed):
+				output.write(puzzle + "\n")
+		except GenerationError as error:
+			parser.exit(1, f"{error}\n")
+
+	elapsed = time.perf_counter() - start_time
+	print(f"{args.count} puzzles in {elapsed:.2f} s ({args.count / elapsed * 60:.0f} puzzles/minute).", file=sys.stderr)
+
+
+if __name__ == "__main__":
+	main()
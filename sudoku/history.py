@@ -0,0 +1,52 @@
+# Records the state of the grid after each step as the differences from the previous step,
+# so that memory grows with the number of changes instead of the number of steps times the size of the grid.
+# Squares are indexed by row * grid_size + column, and candidates are stored as bitmasks (see bitmasks.py).
+class History:
+	def __init__(self, values, masks):
+		self.initial_values = list(values)
+		self.initial_masks = list(masks)
+
+		# The state of the last recorded step, used to find the differences with the next one.
+		self.last_values = list(values)
+		self.last_masks = list(masks)
+
+		# Each delta turns the state of the previous step into the state of the next one, and stores
+		# the new value of each changed square and the candidate bits that were toggled in each square.
+		self.deltas = []
+
+	# Returns the number of recorded steps, including the initial state.
+	def __len__(self):
+		return len(self.deltas) + 1
+
+	def record(self, values, masks):
+		changed_values = []
+		for index, n in enumerate(values):
+			if n != self.last_values[index]:
+				changed_values.append((index, n))
+				self.last_values[index] = n
+
+		toggled_candidates = []
+		for index, mask in enumerate(masks):
+			if mask != self.last_masks[index]:
+				toggled_candidates.append((index, mask ^ self.last_masks[index]))
+				self.last_masks[index] = mask
+
+		self.deltas.append((tuple(changed_values), tuple(toggled_candidates)))
+
+	# Rebuilds the values and candidate masks of any step by replaying the deltas.
+	# Negative steps are counted from the end, like list indices.
+	def state(self, step):
+		if step < 0:
+			step += len(self)
+
+		values = list(self.initial_values)
+		masks = list(self.initial_masks)
+
+		for (changed_values, toggled_candidates) in self.deltas[:step]:
+			for (index, n) in changed_values:
+				values[index] = n
+
+			for (index, toggled) in toggled_candidates:
+				masks[index] ^= toggled
+
+		return values, masks
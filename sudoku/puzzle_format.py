@@ -0,0 +1,75 @@
+# Text format for puzzles, used by the command-line tools.
+# Each puzzle is written on a single line, listing the squares row by row, in one of two ways:
+# - One character per square: 1-9, then A for 10, B for 11 and so on, with 0 or . for empty squares.
+#   A 9x9 puzzle is a line of 81 characters, and a 16x16 puzzle is a line of 256 characters.
+# - Numbers separated by spaces or commas, with 0 for empty squares. This works for grids of any size.
+
+symbols = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+empty_symbols = "0."
+
+# The tables used by parse_puzzle_bytes, by grid size (see symbol_table).
+symbol_tables = {}
+
+
+# Returns the rows of the puzzle and its box size.
+def parse_puzzle(line):
+	line = line.strip()
+
+	if " " in line or "," in line:
+		values = [int(value) for value in line.replace(",", " ").split()]
+	else:
+		values = [0 if symbol in empty_symbols else symbols.index(symbol.upper()) + 1 for symbol in line]
+
+	box_size = round(len(values) ** 0.25)
+	grid_size = box_size ** 2
+	if box_size < 2 or grid_size ** 2 != len(values):
+		raise ValueError(f"A puzzle can't have {len(values)} squares.")
+
+	if any(n < 0 or n > grid_size for n in values):
+		raise ValueError(f"Numbers must be between 0 and {grid_size}.")
+
+	rows = [values[i * grid_size:(i + 1) * grid_size] for i in range(grid_size)]
+
+	return rows, box_size
+
+
+# Returns the number of each symbol of the grid size by its byte value, for bytes.translate.
+# Bytes that aren't symbols of the grid size map to 255.
+def symbol_table(grid_size):
+	if grid_size not in symbol_tables:
+		table = bytearray([255] * 256)
+		for (value, symbol) in enumerate(symbols[:grid_size], 1):
+			table[ord(symbol)] = table[ord(symbol.lower())] = value
+		for symbol in empty_symbols:
+			table[ord(symbol)] = 0
+
+		symbol_tables[grid_size] = bytes(table)
+
+	return symbol_tables[grid_size]
+
+
+# Same as parse_puzzle, for a line given as bytes (such as the lines read by puzzle_io.py).
+# Lines with one character per square are converted with bytes.translate, without decoding them or going through
+# each symbol in Python. Other lines, including invalid ones, are decoded and given to parse_puzzle.
+def parse_puzzle_bytes(line):
+	line = line.strip()
+
+	box_size = round(len(line) ** 0.25)
+	grid_size = box_size ** 2
+	if box_size >= 2 and grid_size ** 2 == len(line):
+		values = line.translate(symbol_table(grid_size))
+
+		if b"\xff" not in values:
+			rows = memoryview(values).cast("B", (grid_size, grid_size)).tolist()
+
+			return rows, box_size
+
+	return parse_puzzle(line.decode())
+
+
+# Returns the puzzle on a single line, using one character per square when possible.
+def format_puzzle(rows):
+	if len(rows) > len(symbols):
+		return " ".join(str(n) for row in rows for n in row)
+
+	return "".join(symbols[n - 1] if n != 0 else "0" for row in rows for n in row)
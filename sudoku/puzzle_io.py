@@ -0,0 +1,67 @@
+# Streaming input and output for files of puzzles (see puzzle_format.py for the format), which can be much larger than
+# the available memory. Puzzles are read one line at a time from a memory-mapped file and parsed lazily, and results are
+# written through a large buffer, so memory use doesn't depend on the size of the files.
+#
+# Usage:
+# for (rows, box_size) in read_puzzles("puzzles.txt"):
+#     ...
+import mmap
+import sys
+
+from puzzle_format import parse_puzzle_bytes
+
+# The size of the output buffer, in bytes.
+output_buffer_size = 1 << 20
+
+
+# Yields the lines of the file that hold a puzzle, as bytes without the line ending, skipping empty lines and
+# comments (lines starting with #).
+# The file is memory-mapped, so the operating system only loads the pages being read, and can drop them again since
+# they are read in order. Files that can't be mapped, such as pipes and empty files, are read line by line instead.
+def read_puzzle_lines(path):
+	with open(path, "rb") as file:
+		try:
+			mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+		except (ValueError, OSError):
+			mapping = None
+
+		if mapping is None:
+			for line in file:
+				line = line.strip()
+				if line != b"" and not line.startswith(b"#"):
+					yield line
+
+			return
+
+		with mapping:
+			if hasattr(mmap, "MADV_SEQUENTIAL"):
+				mapping.madvise(mmap.MADV_SEQUENTIAL)
+
+			start = 0
+			size = len(mapping)
+			while start < size:
+				end = mapping.find(b"\n", start)
+				if end == -1:
+					end = size
+
+				line = mapping[start:end].strip()
+				start = end + 1
+
+				if line != b"" and not line.startswith(b"#"):
+					yield line
+
+
+# Yields the rows and box size of each puzzle of the file, parsing each line only when it is reached.
+# Raises ValueError on the first invalid puzzle.
+def read_puzzles(path):
+	for line in read_puzzle_lines(path):
+		yield parse_puzzle_bytes(line)
+
+
+# Opens a file for writing lines of text with a large buffer, so that writing each result doesn't need a system call.
+# Without a path, the lines are written to standard output, which is left open afterwards.
+def open_output(path=None):
+	if path is None:
+		return open(sys.stdout.fileno(), "w", buffering=output_buffer_size, closefd=False)
+
+	return open(path, "w", buffering=output_buffer_size)
@@ -0,0 +1,116 @@
+# Exact cover search (Knuth's Algorithm X), used when the logical strategies get stuck.
+# Each option places a number in an empty square, and each constraint must be covered by exactly one option:
+# every square holds a number, and every row, column and box holds each number once.
+# The options of each constraint are kept in sets, which plays the same role as the dancing links.
+# Squares are indexed by row * grid_size + column, and candidates are stored as bitmasks (see bitmasks.py).
+from bitmasks import *
+
+
+# Returns up to `limit` solutions reachable from the given values and candidates, along with the
+# number of search nodes visited. Each solution is a flat list of values.
+# values: the number in each square, 0 for empty squares.
+# masks: the candidates of each empty square.
+def search_solutions(values, masks, box_size, limit=1):
+	grid_size = box_size ** 2
+
+	def option_constraints(index, n):
+		i = index // grid_size
+		j = index % grid_size
+		digit = n - 1
+
+		return [
+			index,
+			grid_size ** 2 + i * grid_size + digit,
+			2 * grid_size ** 2 + j * grid_size + digit,
+			3 * grid_size ** 2 + box_index(i, j, box_size) * grid_size + digit
+		]
+
+	# Constraints that are already covered by a filled square aren't part of the problem.
+	covered = set()
+	for index, n in enumerate(values):
+		if n != 0:
+			covered.update(option_constraints(index, n))
+
+	options = {}
+	constraints = {c: set() for c in range(4 * grid_size ** 2) if c not in covered}
+	for index, n in enumerate(values):
+		if n != 0:
+			continue
+
+		for candidate in mask_digits(masks[index]):
+			option = (index, candidate)
+			options[option] = [c for c in option_constraints(index, candidate) if c not in covered]
+
+			# Candidates that conflict with a filled square can never be selected.
+			if len(options[option]) < 4:
+				del options[option]
+				continue
+
+			for c in options[option]:
+				constraints[c].add(option)
+
+	solutions = []
+	selected = []
+	nodes = 0
+
+	def select(option):
+		removed_columns = []
+		for c in options[option]:
+			for other_option in constraints[c]:
+				for other_c in options[other_option]:
+					if other_c != c:
+						constraints[other_c].remove(other_option)
+
+			removed_columns.append(constraints.pop(c))
+
+		return removed_columns
+
+	def deselect(option, removed_columns):
+		for c in reversed(options[option]):
+			constraints[c] = removed_columns.pop()
+			for other_option in constraints[c]:
+				for other_c in options[other_option]:
+					if other_c != c:
+						constraints[other_c].add(other_option)
+
+	def visit():
+		nonlocal nodes
+		nodes += 1
+
+		if len(constraints) == 0:
+			solution = list(values)
+			for (index, n) in selected:
+				solution[index] = n
+
+			solutions.append(solution)
+			return len(solutions) >= limit
+
+		# Always branch on the constraint with the fewest options left.
+		best_constraint = None
+		best_count = 0
+		for c, constraint_options in constraints.items():
+			count = len(constraint_options)
+			if best_constraint is None or count < best_count:
+				best_constraint = c
+				best_count = count
+
+				if count <= 1:
+					break
+
+		for option in list(constraints[best_constraint]):
+			selected.append(option)
+			removed_columns = select(option)
+
+			done = visit()
+
+			deselect(option, removed_columns)
+			selected.pop()
+
+			if done:
+				return True
+
+		return False
+
+	visit()
+
+	return solutions, nodes
@@ -0,0 +1,329 @@
+# A local HTTP service that solves puzzles sent as JSON, using asyncio and the standard library only.
+# The puzzles are solved on a pool of worker processes. Requests that arrive within a few milliseconds of each
+# other are sent to the workers together (micro-batching), which saves a round trip to a worker for each puzzle.
+#
+# POST /solve with a JSON object:
+#   "puzzle": the puzzle on a single line (see puzzle_format.py), or "rows": a list of rows of numbers.
+#   "search" (optional): use search when the strategies get stuck.
+#   "explanations" (optional): also return the explanation of each step.
+# The response has "solution", "rows", "solved", "total_steps", "max_difficulty", and "explanations" if requested.
+# GET /stats returns counters about the requests and batches.
+#
+# When too many requests are waiting, new ones are refused with 503 so that clients can retry later.
+#
+# Usage: python server.py [--port 8080] [--workers 4] [--batch-size 32] [--batch-window 2] [--max-pending 1000]
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from puzzle_format import format_puzzle, parse_puzzle
+from solver import solve
+
+logger = logging.getLogger("sudoku.server")
+
+# Each worker process reuses one Sudoku object per box size for all of its puzzles.
+worker_sudokus = {}
+
+max_body_size = 1024 * 1024
+
+reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+		   413: "Payload Too Large", 503: "Service Unavailable"}
+
+
+# Raised when the request can't be queued because too many requests are already waiting.
+class ServiceBusyError(Exception):
+	pass
+
+
+# Returns the rows, box size and options of a /solve request, or raises ValueError if it is invalid.
+def parse_request(body):
+	try:
+		request = json.loads(body)
+	except json.JSONDecodeError as error:
+		raise ValueError(f"Invalid JSON: {error}")
+
+	if not isinstance(request, dict):
+		raise ValueError("The request must be a JSON object.")
+
+	if "puzzle" in request:
+		if not isinstance(request["puzzle"], str):
+			raise ValueError("\"puzzle\" must be a string.")
+
+		(rows, box_size) = parse_puzzle(request["puzzle"])
+
+	elif "rows" in request:
+		rows = request["rows"]
+		if not isinstance(rows, list) or not all(isinstance(row, list) for row in rows):
+			raise ValueError("\"rows\" must be a list of rows.")
+
+		# Parsing the values on one line checks the size and the numbers.
+		(rows, box_size) = parse_puzzle(" ".join(str(n) for row in rows for n in row))
+
+	else:
+		raise ValueError("The request must have a \"puzzle\" or \"rows\".")
+
+	return rows, box_size, bool(request.get("search", False)), bool(request.get("explanations", False))
+
+
+# Solves one puzzle in a worker process and returns the response.
+def solve_request(rows, box_size, use_search, explanations):
+	sudoku = solve(rows, box_size, use_search, worker_sudokus.get(box_size), record_history=explanations)
+	worker_sudokus[box_size] = sudoku
+
+	grid = sudoku.get_grid_values()
+	response = {
+		"solution": format_puzzle(grid),
+		"rows": grid,
+		"solved": sudoku.is_solved,
+		"total_steps": sudoku.total_steps,
+		"max_difficulty": sudoku.max_difficulty
+	}
+
+	if explanations:
+		response["explanations"] = [
+			{"text": explanation.text, "square": explanation.modified_square_pos} for explanation in sudoku.explanations]
+
+	return response
+
+
+def solve_requests(requests):
+	return [solve_request(*request) for request in requests]
+
+
+class SolveService:
+	def __init__(self, workers, batch_size, batch_window, max_pending, max_batches):
+		self.executor = ProcessPoolExecutor(workers)
+
+		self.batch_size = batch_size
+		self.batch_window = batch_window
+		self.max_pending = max_pending
+
+		# Requests waiting to be sent to a worker, as (request, future) pairs.
+		self.waiting = deque()
+		self.has_waiting = asyncio.Event()
+
+		# Limits how many batches are being solved at once. While all workers are busy, requests keep waiting
+		# (and are batched together), until max_pending is reached.
+		self.running_batches = asyncio.Semaphore(max_batches)
+
+		# The batches being solved. The event loop only keeps weak references to tasks, so they are kept here until
+		# they are done.
+		self.batch_tasks = set()
+
+		# The number of requests waiting or being solved.
+		self.pending = 0
+
+		self.stats = {"requests": 0, "refused": 0, "batches": 0, "solved_puzzles": 0}
+
+	async def solve(self, request):
+		if self.pending >= self.max_pending:
+			self.stats["refused"] += 1
+			raise ServiceBusyError()
+
+		self.stats["requests"] += 1
+		self.pending += 1
+		try:
+			future = asyncio.get_running_loop().create_future()
+			self.waiting.append((request, future))
+			self.has_waiting.set()
+
+			return await future
+		finally:
+			self.pending -= 1
+
+	# Sends the waiting requests to the workers in batches, for as long as the service runs.
+	async def run_batches(self):
+		while True:
+			await self.has_waiting.wait()
+
+			# Give requests arriving close together a chance to join the batch.
+			if len(self.waiting) < self.batch_size:
+				await asyncio.sleep(self.batch_window)
+
+			await self.running_batches.acquire()
+
+			items = []
+			while len(self.waiting) > 0 and len(items) < self.batch_size:
+				items.append(self.waiting.popleft())
+
+			if len(self.waiting) == 0:
+				self.has_waiting.clear()
+
+			task = asyncio.create_task(self.run_batch(items))
+			self.batch_tasks.add(task)
+			task.add_done_callback(self.batch_done)
+
+	def batch_done(self, task):
+		self.batch_tasks.discard(task)
+
+		if not task.cancelled() and task.exception() is not None:
+			logger.error("A batch failed.", exc_info=task.exception())
+
+	async def run_batch(self, items):
+		try:
+			results = await asyncio.get_running_loop().run_in_executor(
+				self.executor, solve_requests, [request for (request, _) in items])
+
+			self.stats["batches"] += 1
+			self.stats["solved_puzzles"] += len(items)
+
+			for ((_, future), result) in zip(items, results):
+				if not future.done():
+					future.set_result(result)
+
+		except Exception as error:
+			for (_, future) in items:
+				if not future.done():
+					future.set_exception(error)
+
+		finally:
+			self.running_batches.release()
+
+	def get_stats(self):
+		stats = dict(self.stats)
+		stats["pending"] = self.pending
+		stats["average_batch_size"] = stats["solved_puzzles"] / stats["batches"] if stats["batches"] > 0 else 0
+
+		return stats
+
+	# Returns the status and the JSON response of a request.
+	async def route(self, method, path, body):
+		if path == "/solve":
+			if method != "POST":
+				return 405, {"error": "Use POST to solve a puzzle."}
+
+			try:
+				request = parse_request(body)
+			except ValueError as error:
+				return 400, {"error": str(error)}
+
+			try:
+				return 200, await self.solve(request)
+			except ServiceBusyError:
+				return 503, {"error": "Too many requests are waiting, try again later."}
+
+		if path == "/stats":
+			return 200, self.get_stats()
+
+		return 404, {"error": f"Unknown path {path}."}
+
+	async def handle_connection(self, reader, writer):
+		try:
+			# Connections are kept open for more requests, unless the client asks to close them.
+			while True:
+				request_line = await reader.readline()
+				if not request_line:
+					break
+
+				try:
+					(method, path, version) = request_line.decode("latin-1").split()
+				except ValueError:
+					await send_response(writer, 400, {"error": "Invalid request line."}, False)
+					break
+
+				headers = {}
+				while True:
+					line = await reader.readline()
+					if line in (b"\r\n", b"\n", b""):
+						break
+
+					(name, _, value) = line.decode("latin-1").partition(":")
+					headers[name.strip().lower()] = value.strip()
+
+				keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+				try:
+					length = int(headers.get("content-length", "0"))
+				except ValueError:
+					length = -1
+
+				if length < 0:
+					await send_response(writer, 400, {"error": "Invalid Content-Length."}, False)
+					break
+
+				if length > max_body_size:
+					await send_response(writer, 413, {"error": "The request is too large."}, False)
+					break
+
+				body = await reader.readexactly(length)
+
+				(status, response) = await self.route(method, path, body)
+				await send_response(writer, status, response, keep_alive)
+
+				if not keep_alive:
+					break
+
+		except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+			pass
+
+		finally:
+			writer.close()
+
+
+async def send_response(writer, status, response, keep_alive):
+	body = json.dumps(response).encode()
+	headers = [
+		f"HTTP/1.1 {status} {reasons[status]}",
+		"Content-Type: application/json",
+		f"Content-Length: {len(body)}",
+		f"Connection: {'keep-alive' if keep_alive else 'close'}"
+	]
+	if status == 503:
+		headers.append("Retry-After: 1")
+
+	writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+	await writer.drain()
+
+
+async def serve(host, port, workers, batch_size, batch_window, max_pending, max_batches):
+	service = SolveService(workers, batch_size, batch_window, max_pending, max_batches)
+	batches_task = asyncio.create_task(service.run_batches())
+
+	server = await asyncio.start_server(service.handle_connection, host, port)
+
+	# Stop like on Ctrl+C when terminated, so that the worker processes are shut down too.
+	try:
+		asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+	except NotImplementedError:
+		pass
+
+	print(f"Solving puzzles on http://{host}:{port}/solve with {workers} workers.", flush=True)
+
+	try:
+		async with server:
+			await server.serve_forever()
+	finally:
+		batches_task.cancel()
+		service.executor.shutdown(cancel_futures=True)
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Serve a local HTTP/JSON endpoint that solves puzzles.")
+	parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+	parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+	parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+	parser.add_argument("--batch-size", type=int, default=32, help="maximum number of puzzles sent to a worker at once")
+	parser.add_argument("--batch-window", type=float, default=2,
+						help="milliseconds to wait for more requests before sending a batch")
+	parser.add_argument("--max-pending", type=int, default=1000,
+						help="number of waiting requests after which new ones are refused")
+	parser.add_argument("--max-batches", type=int, default=None,
+						help="number of batches solved at once (default: twice the number of workers)")
+	args = parser.parse_args()
+
+	max_batches = args.max_batches if args.max_batches is not None else 2 * args.workers
+
+	try:
+		asyncio.run(serve(args.host, args.port, args.workers, args.batch_size, args.batch_window / 1000,
+						  args.max_pending, max_batches))
+	except (KeyboardInterrupt, asyncio.CancelledError):
+		pass
+
+
+if __name__ == "__main__":
+	main()
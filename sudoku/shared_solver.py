@@ -0,0 +1,161 @@
+# Solves puzzles in parallel worker processes that exchange them through shared memory, so that no puzzle or result
+# is pickled. This matters for easy puzzles, which take less time to solve than to send to another process.
+#
+# The puzzles go through two rings of `slot_count` slots in shared memory, each holding a chunk of puzzles in the
+# binary format (see binary_format.py). The main process writes each chunk in the next slot of the input ring, a
+# worker takes the next chunk and writes its results in the same slot of the output ring, and the main process reads
+# the results in order and frees the slot. Besides the rings, only counters are shared:
+# - filled: the number of chunks written and not yet taken by a worker, then one more for each worker at the end.
+# - next_chunk: the number of chunks taken by the workers, and total_chunks: the number of chunks once all are written.
+# - finished: released by a worker each time it solved a chunk, and done: whether the chunk in each slot is solved.
+# - free: the number of slots that can be written.
+#
+# Usage:
+# for (values, is_solved, total_steps, max_difficulty) in solve_shared(puzzles, 3, workers=8):
+#     ...
+import multiprocessing
+from itertools import islice
+from multiprocessing.shared_memory import SharedMemory
+
+from binary_format import PuzzleArray, rating_flag, solution_flag
+from solver import Sudoku
+
+result_flags = solution_flag | rating_flag
+
+# How long the main process waits for a chunk before checking that the workers are still running, in seconds.
+worker_check_interval = 1
+
+
+# Takes chunks until there are none left, and solves them. Runs in each worker process.
+def solve_chunks(input_name, output_name, box_size, chunk_size, slot_count, chunk_sizes, done, filled, finished,
+				 next_chunk, total_chunks, use_search, batch):
+	input_memory = SharedMemory(input_name)
+	output_memory = SharedMemory(output_name)
+	inputs = PuzzleArray(input_memory.buf, box_size)
+	outputs = PuzzleArray(output_memory.buf, box_size, result_flags)
+
+	grid_size = box_size ** 2
+	sudoku = Sudoku([[0] * grid_size for _ in range(grid_size)], box_size, record_history=False)
+	sudoku.fast = True
+	sudoku.use_search = use_search
+	sudoku.batch = batch
+
+	try:
+		while True:
+			filled.acquire()
+
+			with next_chunk.get_lock():
+				chunk = next_chunk.value
+				if total_chunks.value != -1 and chunk >= total_chunks.value:
+					return
+
+				next_chunk.value = chunk + 1
+
+			slot = chunk % slot_count
+			for index in range(slot * chunk_size, slot * chunk_size + chunk_sizes[slot]):
+				sudoku.load_values(inputs[index], box_size)
+				sudoku.start_solve()
+
+				outputs.write(index, sudoku.values, (sudoku.is_solved, sudoku.total_steps, sudoku.max_difficulty))
+
+			done[slot] = 1
+			finished.release()
+	finally:
+		inputs.release()
+		outputs.release()
+		input_memory.close()
+		output_memory.close()
+
+
+# Yields (values, is_solved, total_steps, max_difficulty) for each puzzle, in the same order, where values is the
+# final grid as a bytearray indexed by row * grid_size + column, like Sudoku.values.
+# puzzles: the squares of each puzzle in the same way (bytes, a bytearray or a list), all with the same box size.
+# Up to slot_count chunks of chunk_size puzzles are in shared memory at once (4 per worker by default).
+def solve_shared(puzzles, box_size, workers, chunk_size=64, slot_count=None, use_search=False, batch=False):
+	if slot_count is None:
+		slot_count = 4 * workers
+
+	capacity = slot_count * chunk_size
+	input_memory = SharedMemory(create=True, size=PuzzleArray.buffer_size(capacity, box_size))
+	output_memory = SharedMemory(create=True, size=PuzzleArray.buffer_size(capacity, box_size, result_flags))
+	inputs = PuzzleArray(input_memory.buf, box_size)
+	outputs = PuzzleArray(output_memory.buf, box_size, result_flags)
+
+	chunk_sizes = multiprocessing.Array("i", slot_count, lock=False)
+	done = multiprocessing.Array("b", slot_count, lock=False)
+	filled = multiprocessing.Semaphore(0)
+	finished = multiprocessing.Semaphore(0)
+	free = multiprocessing.Semaphore(slot_count)
+	next_chunk = multiprocessing.Value("q", 0)
+	total_chunks = multiprocessing.Value("q", -1, lock=False)
+
+	processes = [multiprocessing.Process(
+		target=solve_chunks, daemon=True,
+		args=(input_memory.name, output_memory.name, box_size, chunk_size, slot_count, chunk_sizes, done, filled,
+			  finished, next_chunk, total_chunks, use_search, batch))
+		for _ in range(workers)]
+
+	# Waits for the chunk in order to be solved, and returns its results.
+	def read_chunk(chunk):
+		slot = chunk % slot_count
+		while not done[slot]:
+			if not finished.acquire(timeout=worker_check_interval) and \
+					any(process.exitcode not in (None, 0) for process in processes):
+				raise RuntimeError("A worker process stopped unexpectedly.")
+
+		results = []
+		for index in range(slot * chunk_size, slot * chunk_size + chunk_sizes[slot]):
+			(values, (is_solved, total_steps, max_difficulty)) = outputs.read(index)
+			results.append((values, is_solved, total_steps, max_difficulty))
+
+		done[slot] = 0
+		free.release()
+
+		return results
+
+	try:
+		for process in processes:
+			process.start()
+
+		puzzles = iter(puzzles)
+		written_chunks = 0
+		read_chunks = 0
+		while True:
+			chunk = list(islice(puzzles, chunk_size))
+			if len(chunk) == 0:
+				break
+
+			# Read the results of the oldest chunks until a slot is free.
+			while not free.acquire(block=False):
+				yield from read_chunk(read_chunks)
+				read_chunks += 1
+
+			slot = written_chunks % slot_count
+			for (k, values) in enumerate(chunk):
+				inputs[slot * chunk_size + k] = values
+
+			chunk_sizes[slot] = len(chunk)
+			written_chunks += 1
+			filled.release()
+
+		total_chunks.value = written_chunks
+		for _ in processes:
+			filled.release()
+
+		while read_chunks < written_chunks:
+			yield from read_chunk(read_chunks)
+			read_chunks += 1
+
+		for process in processes:
+			process.join()
+	finally:
+		for process in processes:
+			if process.is_alive():
+				process.terminate()
+
+		inputs.release()
+		outputs.release()
+		input_memory.close()
+		output_memory.close()
+		input_memory.unlink()
+		output_memory.unlink()
@@ -0,0 +1,157 @@
+# Counts the solutions of a puzzle, to check that it has exactly one.
+# The counting repeats the deductions of the first strategies of Sudoku on candidate masks until they stall, with
+# the same helpers (see bitmasks.py): naked singles (is_single, a square with a single candidate) and hidden singles
+# (hidden_digits and single_position, a digit with a single square left in a row, column or box). It then tries each
+# candidate of the empty square with the fewest candidates, and stops as soon as `limit` solutions are found, so that
+# telling a unique puzzle from one with several solutions only needs to find two of them.
+# Squares are indexed by row * grid_size + column.
+from bitmasks import *
+from units import get_units
+
+
+# Returns the number of solutions reachable from the given values and candidates, counting at most `limit`.
+# values: the number in each square, 0 for empty squares.
+# masks: the candidates of each empty square.
+def count_completions(values, masks, box_size, limit=2):
+	units = get_units(box_size)
+	unit_indices = units.all_unit_indices
+	peer_indices = units.peer_indices
+	all_digits = full_mask(box_size ** 2)
+	squares = range(len(values))
+
+	# The bit of each number, with no bit for empty squares.
+	bits = [0] + [digit_bit(n) for n in range(1, box_size ** 2 + 1)]
+
+	# Places the digit with the given bit in the square, and removes it from the candidates of the peers.
+	# Peers left with a single candidate are added to singles. Returns False if a peer is left without candidates.
+	def place(values, masks, index, bit, singles):
+		values[index] = bit.bit_length()
+		masks[index] = 0
+
+		for peer in peer_indices[index]:
+			mask = masks[peer]
+			if mask & bit:
+				mask ^= bit
+				masks[peer] = mask
+				if mask == 0:
+					return False
+
+				if is_single(mask):
+					singles.append(peer)
+
+		return True
+
+	# Fills naked and hidden singles until there are none left. Returns False if a contradiction is found.
+	# Naked singles are filled as soon as they appear, and the units are only checked for hidden singles
+	# once there are no naked singles left, since that takes longer.
+	def propagate(values, masks):
+		singles = [index for index in squares if is_single(masks[index])]
+
+		while True:
+			while singles:
+				index = singles.pop()
+				mask = masks[index]
+
+				# The square may have been filled since it was added.
+				if mask != 0 and not place(values, masks, index, mask, singles):
+					return False
+
+			for unit in unit_indices:
+				(hidden, covered) = hidden_digits([masks[index] for index in unit])
+
+				placed = 0
+				for index in unit:
+					placed |= bits[values[index]]
+
+				# A digit that is neither placed nor a candidate anywhere in the unit can't be placed.
+				if covered | placed != all_digits:
+					return False
+
+				while hidden:
+					bit = hidden & -hidden
+					hidden ^= bit
+
+					# The only square for the digit may have been filled with another hidden single.
+					position = single_position((masks[index] for index in unit), bit)
+					if position == -1 or not place(values, masks, unit[position], bit, singles):
+						return False
+
+				# Fill the new naked singles before checking more units.
+				if singles:
+					break
+			else:
+				return True
+
+	def count(values, masks, limit):
+		if not propagate(values, masks):
+			return 0
+
+		best_index = -1
+		best_size = 0
+		for index in squares:
+			mask = masks[index]
+			if mask != 0:
+				size = mask_size(mask)
+				if best_index == -1 or size < best_size:
+					best_index = index
+					best_size = size
+
+					if size == 2:
+						break
+
+		if best_index == -1:
+			return 1
+
+		total = 0
+		mask = masks[best_index]
+		while mask:
+			bit = mask & -mask
+			mask ^= bit
+
+			guess_values = list(values)
+			guess_masks = list(masks)
+			if place(guess_values, guess_masks, best_index, bit, []):
+				total += count(guess_values, guess_masks, limit - total)
+				if total >= limit:
+					break
+
+		return total
+
+	values = list(values)
+	masks = [mask if n == 0 else 0 for (n, mask) in zip(values, masks)]
+
+	# An empty square without candidates, or a digit placed twice in a unit, leaves no solution.
+	if any(n == 0 and mask == 0 for (n, mask) in zip(values, masks)):
+		return 0
+
+	for unit in unit_indices:
+		placed = 0
+		for index in unit:
+			if placed & bits[values[index]]:
+				return 0
+
+			placed |= bits[values[index]]
+
+	return count(values, masks, limit)
+
+
+# Returns the number of solutions of the puzzle, given as a list of rows, stopping as soon as `limit` solutions are
+# found, so count_solutions(rows, box_size) == 1 checks that the puzzle has a unique solution.
+# The candidates are the digits not yet placed in each square's row, column and box, like the candidates
+# Sudoku starts from (see Sudoku.count_solutions to count from the candidates of a puzzle being solved).
+def count_solutions(rows, box_size, limit=2):
+	grid_size = box_size ** 2
+	all_digits = full_mask(grid_size)
+	(row_masks, column_masks, box_masks) = unit_masks(rows, box_size)
+
+	values = []
+	masks = []
+	for i, row in enumerate(rows):
+		for j, n in enumerate(row):
+			values.append(n)
+			if n != 0:
+				masks.append(0)
+			else:
+				masks.append(all_digits & ~(row_masks[i] | column_masks[j] | box_masks[box_index(i, j, box_size)]))
+
+	return count_completions(values, masks, box_size, limit)
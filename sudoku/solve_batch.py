@@ -0,0 +1,267 @@
+# Solves a file of puzzles in parallel (see puzzle_format.py for the input format).
+# The file is read as a stream (see puzzle_io.py), and the lines are parsed by the workers (or by the main process with
+# --shared-memory, see solve_batch_shared).
+# For each puzzle, one line is written in the same order as the input, with tab-separated fields:
+# the final grid, "solved" or "failed", the total steps and the max difficulty.
+# They are the same with --vectorized, except for the total steps with both --vectorized and --batch (see bulk.py).
+# With --cache-size, a solved puzzle can get the total steps and max difficulty of an equivalent puzzle solved before
+# it, and with --search another of its solutions (see cache.py). The results of unsolved puzzles are the same.
+#
+# Usage: python solve_batch.py puzzles.txt [-o solutions.txt] [--workers 8] [--chunk-size 64] [--search] [--batch]
+#                             [--vectorized] [--cache-size 10000] [--cache-file cache.db] [--strategy-stats stats.json]
+#                             [--shared-memory]
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from cache import ResultCache
+from puzzle_format import format_puzzle, parse_puzzle_bytes
+from puzzle_io import open_output, read_puzzle_lines
+from shared_solver import solve_shared
+from solver import StrategyStats, solve
+
+# Each worker process reuses one Sudoku object per box size for all of its puzzles.
+worker_sudokus = {}
+
+# With --cache-size, each worker process keeps a cache of its results (see cache.py).
+worker_cache = None
+
+# With --strategy-stats, what each strategy did in the puzzles of the current chunk, by strategy name.
+worker_strategy_stats = None
+
+
+def format_result(rows, is_solved, total_steps, max_difficulty):
+	status = "solved" if is_solved else "failed"
+
+	return f"{format_puzzle(rows)}\t{status}\t{total_steps}\t{max_difficulty}"
+
+
+def invalid_result(line):
+	return f"{line.strip().decode(errors='replace')}\tinvalid\t0\t0"
+
+
+# Solves a line of the input, given as bytes.
+def solve_line(line, use_search, batch):
+	try:
+		(rows, box_size) = parse_puzzle_bytes(line)
+	except ValueError:
+		return invalid_result(line)
+
+	if worker_cache is not None:
+		return format_result(*worker_cache.solve(rows, box_size, use_search, batch))
+
+	sudoku = solve(rows, box_size, use_search, worker_sudokus.get(box_size), record_history=False, batch=batch)
+	worker_sudokus[box_size] = sudoku
+
+	if worker_strategy_stats is not None:
+		add_strategy_stats(worker_strategy_stats, sudoku.strategy_stats)
+
+	return format_result(sudoku.get_grid_values(), sudoku.is_solved, sudoku.total_steps, sudoku.max_difficulty)
+
+
+# Solves the puzzles of each size in the chunk together with bulk.py, which needs NumPy.
+def solve_chunk_vectorized(lines, use_search, batch):
+	# Only imported here, so that NumPy isn't needed without --vectorized.
+	from bulk import solve_bulk
+
+	results = [None] * len(lines)
+	puzzles_by_size = {}
+	for i, line in enumerate(lines):
+		try:
+			(rows, box_size) = parse_puzzle_bytes(line)
+		except ValueError:
+			results[i] = invalid_result(line)
+			continue
+
+		puzzles_by_size.setdefault(box_size, []).append((i, rows))
+
+	for box_size, puzzles in puzzles_by_size.items():
+		bulk_results = solve_bulk([rows for (_, rows) in puzzles], box_size, use_search, batch)
+		for ((i, _), result) in zip(puzzles, bulk_results):
+			results[i] = format_result(*result)
+
+	return results
+
+
+# Adds the StrategyStats of each strategy to the totals, by strategy name.
+def add_strategy_stats(totals, strategy_stats):
+	for name, stats in strategy_stats.items():
+		totals.setdefault(name, StrategyStats()).add(stats)
+
+
+# Returns the results of the chunk, and what each strategy did in its puzzles if strategy_stats is enabled
+# (None otherwise).
+def solve_chunk(lines, use_search, batch, vectorized=False, cache_size=0, cache_file=None, strategy_stats=False):
+	global worker_cache, worker_strategy_stats
+	if cache_size > 0 and worker_cache is None:
+		worker_cache = ResultCache(cache_size, cache_file)
+
+	if vectorized:
+		return solve_chunk_vectorized(lines, use_search, batch), None
+
+	worker_strategy_stats = {} if strategy_stats else None
+	results = [solve_line(line, use_search, batch) for line in lines]
+
+	return results, worker_strategy_stats
+
+
+def read_chunks(lines, chunk_size):
+	chunk = []
+	for line in lines:
+		chunk.append(line)
+		if len(chunk) == chunk_size:
+			yield chunk
+			chunk = []
+
+	if len(chunk) > 0:
+		yield chunk
+
+
+# Yields the result of each puzzle in input order, while the workers keep solving the next chunks.
+# lines: the lines of the puzzles as bytes, such as those yielded by read_puzzle_lines.
+# Only a few chunks per worker are in flight at once, so the input is never loaded in memory all at once.
+# With cache_size, repeated and equivalent puzzles are answered from a cache in each worker, which can be backed
+# by a file shared by all workers and kept between runs.
+# With strategy_stats, a dict, what each strategy did in all the puzzles is added to it as a StrategyStats for each
+# strategy name.
+def solve_batch(lines, workers, chunk_size, use_search=False, batch=False, vectorized=False, cache_size=0,
+				cache_file=None, strategy_stats=None):
+	def chunk_results(future):
+		(results, chunk_strategy_stats) = future.result()
+		if strategy_stats is not None:
+			add_strategy_stats(strategy_stats, chunk_strategy_stats)
+
+		return results
+
+	with ProcessPoolExecutor(workers) as executor:
+		pending = deque()
+		for chunk in read_chunks(lines, chunk_size):
+			pending.append(executor.submit(solve_chunk, chunk, use_search, batch, vectorized, cache_size, cache_file,
+										   strategy_stats is not None))
+
+			if len(pending) >= 2 * workers:
+				yield from chunk_results(pending.popleft())
+
+		while len(pending) > 0:
+			yield from chunk_results(pending.popleft())
+
+
+# Like solve_batch, but the puzzles and results are exchanged with the workers through shared memory instead of being
+# pickled (see shared_solver.py), which is faster for easy puzzles. The lines are parsed here, and all puzzles with the
+# box size of the first valid one go to the workers. The invalid lines and the puzzles of other sizes are answered
+# here, still in input order.
+def solve_batch_shared(lines, workers, chunk_size, use_search=False, batch=False):
+	lines = iter(lines)
+
+	# The result of each line not yet yielded, or None while a worker is solving it.
+	pending = deque()
+
+	box_size = None
+	for line in lines:
+		try:
+			(rows, box_size) = parse_puzzle_bytes(line)
+			break
+		except ValueError:
+			yield invalid_result(line)
+
+	if box_size is None:
+		return
+
+	def shared_puzzles():
+		pending.append(None)
+		yield b"".join(map(bytes, rows))
+
+		for line in lines:
+			try:
+				(line_rows, line_box_size) = parse_puzzle_bytes(line)
+			except ValueError:
+				pending.append(invalid_result(line))
+				continue
+
+			if line_box_size != box_size:
+				pending.append(solve_line(line, use_search, batch))
+				continue
+
+			pending.append(None)
+			yield b"".join(map(bytes, line_rows))
+
+	grid_size = box_size ** 2
+	for (values, is_solved, total_steps, max_difficulty) in solve_shared(shared_puzzles(), box_size, workers, chunk_size,
+																		  use_search=use_search, batch=batch):
+		while pending[0] is not None:
+			yield pending.popleft()
+
+		pending.popleft()
+		result_rows = [values[i:i + grid_size] for i in range(0, len(values), grid_size)]
+		yield format_result(result_rows, is_solved, total_steps, max_difficulty)
+
+	yield from pending
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Solve a file of puzzles in parallel.")
+	parser.add_argument("input", help="file with one puzzle per line")
+	parser.add_argument("-o", "--output", help="file to write the results to (default: standard output)")
+	parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+	parser.add_argument("--chunk-size", type=int, default=64, help="number of puzzles sent to a worker at once")
+	parser.add_argument("--search", action="store_true", help="use search when the strategies get stuck")
+	parser.add_argument("--batch", action="store_true", help="apply all deductions of a strategy in each step")
+	parser.add_argument("--vectorized", action="store_true",
+						help="find singles in whole chunks at once with NumPy (larger chunks work better)")
+	parser.add_argument("--cache-size", type=int, default=0,
+						help="number of results each worker keeps to answer repeated and equivalent puzzles")
+	parser.add_argument("--cache-file", help="SQLite file that keeps the cached results between runs")
+	parser.add_argument("--strategy-stats",
+						help="JSON file to write the calls, successes, eliminations and time of each strategy to")
+	parser.add_argument("--shared-memory", action="store_true",
+						help="exchange puzzles and results with the workers through shared memory instead of pickling them")
+	args = parser.parse_args()
+
+	if args.shared_memory and (args.vectorized or args.cache_size > 0 or args.strategy_stats):
+		parser.error("--shared-memory can't be used with --vectorized, --cache-size or --strategy-stats.")
+
+	if args.strategy_stats and (args.vectorized or args.cache_size > 0):
+		parser.error("--strategy-stats can't be used with --vectorized or --cache-size.")
+
+	if args.vectorized and args.cache_size > 0:
+		parser.error("--cache-size can't be used with --vectorized.")
+
+	if args.cache_file and args.cache_size == 0:
+		parser.error("--cache-file requires --cache-size.")
+
+	if args.vectorized and importlib.util.find_spec("numpy") is None:
+		parser.error("--vectorized requires NumPy (pip install numpy).")
+
+	start_time = time.perf_counter()
+	counts = {"solved": 0, "failed": 0, "invalid": 0}
+	strategy_stats = {} if args.strategy_stats else None
+
+	with open_output(args.output) as output:
+		if args.shared_memory:
+			results = solve_batch_shared(read_puzzle_lines(args.input), args.workers, args.chunk_size, args.search,
+										 args.batch)
+		else:
+			results = solve_batch(read_puzzle_lines(args.input), args.workers, args.chunk_size, args.search, args.batch,
+								  args.vectorized, args.cache_size, args.cache_file, strategy_stats)
+
+		for result in results:
+			output.write(result + "\n")
+			counts[result.split("\t")[1]] += 1
+
+	elapsed = time.perf_counter() - start_time
+	total = sum(counts.values())
+	print(f"{total} puzzles in {elapsed:.2f} s ({total / elapsed:.1f} puzzles/s): "
+		  f"{counts['solved']} solved, {counts['failed']} failed, {counts['invalid']} invalid.", file=sys.stderr)
+
+	if strategy_stats is not None:
+		with open(args.strategy_stats, "w") as stats_file:
+			json.dump({name: stats.to_dict() for name, stats in strategy_stats.items()}, stats_file, indent=2)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,1496 @@
+# The solver logic, independent from the GUI (see main.py).
+# Importing this module does not load PyQt5, so it can be used in scripts and batch jobs.
+import json
+import logging
+import time
+
+from bitmasks import *
+from history import History
+from search import search_solutions
+from solution_count import count_completions
+from units import get_units
+
+max_tries = 1000
+
+# Difficulty recorded for steps where a digit had to be guessed using search.
+search_difficulty = 12
+
+# The number of built-in logical strategies, numbered by difficulty from 1.
+strategy_count = 11
+
+extra_spaces = 1
+
+time_between_steps = 0.05
+
+# The grid after each step and other details are logged at the DEBUG level.
+logger = logging.getLogger("sudoku")
+
+
+# Each square also stores its position in the squares array (indexed by [row][column]).
+class Square:
+	pos = []
+	n = 0
+
+	def __init__(self, pos, n):
+		self.pos = pos
+		self.n = n
+
+	def __str__(self):
+		return str(self.n)
+
+	def __repr__(self):
+		return str(self.n)
+
+	# For simplicity, equality between a square and an int is supported
+	def __eq__(self, other):
+		if type(other) is int:
+			return other == self.n
+		if type(other) is Square:
+			return other.n == self.n
+
+		return False
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	def __gt__(self, other):
+		return self.n > other.n
+
+	def is_empty(self):
+		return self.n == 0
+
+
+# Raised when placing a number that is already in the same row, column or box,
+# which means that the puzzle has no solution (or that a strategy made a wrong deduction).
+class ContradictionError(Exception):
+	def __init__(self, pos, n):
+		super().__init__(f"{n} can't go in {pos}, it is already in the same row, column or box.")
+		self.pos = pos
+		self.n = n
+
+
+# A solving strategy (see register_strategy).
+class Strategy:
+	name = ""
+	difficulty = 0
+
+	# Takes the Sudoku object, and returns True if it filled a square or removed a candidate.
+	function = None
+
+	# Whether the explanations of the strategy show the candidates as they were at the start of the step,
+	# which are then saved in Sudoku.notes["Candidates"] before the strategy runs.
+	uses_step_candidates = False
+
+	def __init__(self, name, difficulty, function, uses_step_candidates=False):
+		self.name = name
+		self.difficulty = difficulty
+		self.function = function
+		self.uses_step_candidates = uses_step_candidates
+
+
+# What a strategy did while solving (see Sudoku.strategy_stats).
+class StrategyStats:
+	# The number of times the strategy was tried, and how many of them changed the grid or the candidates.
+	calls = 0
+	successes = 0
+
+	# The number of candidates removed, including those of the squares filled by the strategy and of their peers.
+	eliminations = 0
+
+	# The total time spent in the strategy, in seconds.
+	time = 0
+
+	def add(self, other):
+		self.calls += other.calls
+		self.successes += other.successes
+		self.eliminations += other.eliminations
+		self.time += other.time
+
+	def to_dict(self):
+		return {"calls": self.calls, "successes": self.successes, "eliminations": self.eliminations, "time": self.time}
+
+
+# The strategies by name, in the order they are tried by default (see Sudoku.strategy_order).
+strategies = {}
+
+
+# Adds a strategy that every Sudoku object tries by default, after the strategies already registered.
+# Strategies with search_difficulty or more make guesses, so they are only tried when use_search is enabled.
+def register_strategy(name, difficulty, function, uses_step_candidates=False):
+	strategies[name] = Strategy(name, difficulty, function, uses_step_candidates)
+
+
+class Explanation:
+	text = ""
+
+	modified_square_pos = None
+
+	affected_sequence = []
+
+	# Each line is stored as [from_square_pos][to_square_pos].
+	crossed_lines = []
+
+	crossed_squares = []
+	circled_squares = []
+	boxed_squares = []
+
+	candidates = []
+	candidates_red = []
+
+	# In batch mode, the explanations of all deductions combined in this one (see Sudoku.complete_step), whose
+	# visuals are all shown with the combined text.
+	parts = None
+
+	def __init__(self, text, modified_square_pos=None, affected_sequence=None,
+				 crossed_lines=None, crossed_squares=None, circled_squares=None, boxed_squares=None,
+				 candidates=None, candidates_red=None, parts=None):
+		self.text = text
+		self.modified_square_pos = modified_square_pos
+		self.affected_sequence = affected_sequence
+		self.crossed_lines = crossed_lines
+		self.crossed_squares = crossed_squares
+		self.circled_squares = circled_squares
+		self.boxed_squares = boxed_squares
+		self.candidates = candidates
+		self.candidates_red = candidates_red
+		self.parts = parts
+
+
+class Sudoku:
+	# Optional callbacks, called after each step and when solving ends (the GUI connects these to Qt signals).
+	on_step_done = None
+	on_finished = None
+
+	paused = False
+
+	# All of the puzzle's state is assigned per instance by load, so that instances never share it.
+	box_size = 0
+	grid_size = 0
+
+	all_possible_numbers = None
+
+	initial_rows = None
+
+	# The number in each square, 0 for empty squares, indexed by row * grid_size + column.
+	values = None
+
+	# 2D array indexed by [row][column].
+	candidates = None
+
+	# Masks of the digits already placed in each row/column/box (see bitmasks.py).
+	row_masks = None
+	column_masks = None
+	box_masks = None
+
+	# The unit and peer tables for the box size (see units.py), shared by all puzzles of that size.
+	units = None
+	peers = None
+
+	# For each unit and digit, a mask of the squares of the unit that still have the digit as a candidate,
+	# where bit i stands for the i-th square of the unit. Indexed by [unit index][n - 1].
+	# This is kept up to date with the candidates by set_square and remove_candidate.
+	digit_positions = None
+
+	# For each strategy, indexed by its difficulty, a mask of the units it still needs to check, where bit i stands
+	# for units.all_units[i]. Some strategies check smaller parts of the grid instead:
+	# - fill_single_possible_squares (difficulty 2) checks each digit of each unit separately, where bit
+	#   u * grid_size + (n - 1) stands for the digit n in units.all_units[u].
+	# - fill_squares_with_one_candidate (difficulty 3) checks squares, where bit i * grid_size + j stands
+	#   for the square [i, j].
+	# - The fish strategies (difficulties 7 to 9) check digits, where bit n - 1 stands for the digit n.
+	# - The wing strategies (difficulties 10 and 11) check the whole grid at once, as bit 0.
+	# A bit is cleared when the strategy checks that part of the grid, and set again whenever a change to the
+	# grid or the candidates could let the strategy find something new in it.
+	dirty = None
+
+	# The number of parts of the grid (as above) checked by each strategy, indexed by its difficulty.
+	scans = None
+
+	# When disabled, every strategy checks the whole grid again on each step.
+	schedule_strategies = True
+
+	# Stores the grid state after each step, and the explanation of each step.
+	# When record_history is disabled, neither is recorded and history is None.
+	record_history = True
+	history = None
+	explanations = None
+
+	current_step = 0
+
+	total_steps = 0
+	max_difficulty = 0
+
+	is_solved = False
+	solve_failed = False
+
+	# When enabled, a search is used to guess the next digit whenever all other strategies fail.
+	use_search = False
+	search_nodes = 0
+	search_time = 0
+
+	# The names of the strategies to try on each step, in order. None tries every registered strategy in the order
+	# they were registered. The first strategy that finds something gives its difficulty to the step.
+	strategy_order = None
+
+	# The names of the strategies that are never tried (see disable_strategy).
+	disabled_strategies = None
+
+	# What each strategy did while solving the current puzzle, as a StrategyStats for each strategy name.
+	strategy_stats = None
+
+	# The number of candidates removed while solving the current puzzle.
+	eliminations = 0
+
+	# When set to the index of a square (row * grid_size + column), solving stops as soon as that square is filled,
+	# without solving the rest of the puzzle. generator.py uses this to rate a puzzle after removing a digit.
+	stop_square = None
+
+	# When set, strategies harder than this difficulty are never tried, so solving fails as soon as one of them would
+	# be needed. generator.py uses this to reject a removal that makes the puzzle too hard without solving the rest.
+	difficulty_limit = None
+
+	candidates_outdated = True
+
+	pause_between_steps = True
+	update_gui = True
+	should_reset_gui_settings = False
+
+	# In fast mode the solver never waits between steps and doesn't report them to the GUI.
+	fast = False
+
+	# In debug mode the whole grid is checked with is_valid after each step, which is slow but catches mistakes that
+	# the checks of set_square would miss. This is independent of the logging level.
+	debug = False
+
+	# In batch mode each step applies every deduction its strategy finds in one pass over the grid, instead of
+	# only the first one. A step then has a single explanation listing all of them, with the explanation of each
+	# deduction in its parts so that the GUI can show all of their visuals.
+	batch = False
+
+	# The number of deductions made, which is the number of steps unless batch mode is enabled.
+	deductions = 0
+
+	logger = logger
+
+	notes = None
+
+	def __init__(self, rows, box_size, record_history=True):
+		self.record_history = record_history
+		self.disabled_strategies = set()
+		self.load(rows, box_size)
+
+	# Replaces the puzzle and resets all solving state, keeping the settings (such as use_search).
+	# This allows reusing the same object to solve many puzzles.
+	def load(self, rows, box_size):
+		self.load_values(bytearray(n for row in rows for n in row), box_size)
+		self.initial_rows = rows
+
+	# Same as load, from a bytearray of the number in each square indexed by row * grid_size + column (such as one
+	# decoded by binary_format.py), which becomes the grid of the solver without being copied.
+	def load_values(self, values, box_size):
+		if box_size != self.box_size:
+			self.box_size = box_size
+			self.grid_size = box_size ** 2
+
+			self.all_possible_numbers = list(range(1, self.grid_size + 1))
+			self.units = get_units(box_size)
+			self.peers = self.units.peers
+
+		self.initial_rows = None
+
+		self.values = values
+
+		self.history = None
+		self.explanations = []
+
+		self.current_step = 0
+		self.total_steps = 0
+		self.max_difficulty = 0
+
+		self.is_solved = False
+		self.solve_failed = False
+
+		self.search_nodes = 0
+		self.search_time = 0
+
+		self.scans = [0] * (strategy_count + 1)
+		self.deductions = 0
+
+		self.strategy_stats = {}
+		self.eliminations = 0
+
+		self.notes = {"Candidates": []}
+
+		# Compute the initial candidates during initialization.
+		# These will be updated by set_square as squares are filled.
+		self.compute_candidates()
+
+		if self.record_history:
+			self.record_step()
+			self.explanations.append(Explanation("Loaded puzzle."))
+
+	# Adds the current grid and candidates to the history.
+	def record_step(self):
+		masks = [digits_mask(candidates) for row in self.candidates for candidates in row]
+
+		if self.history is None:
+			self.history = History(self.values, masks)
+		else:
+			self.history.record(self.values, masks)
+
+	# Returns the grid and candidates recorded for a step, rebuilt from the history.
+	def get_step(self, step):
+		(values, masks) = self.history.state(step)
+
+		grid = [[Square([i, j], values[i * self.grid_size + j]) for j in range(self.grid_size)] for i in range(self.grid_size)]
+		candidates = [[set(mask_digits(masks[i * self.grid_size + j])) for j in range(self.grid_size)] for i in range(self.grid_size)]
+
+		return grid, candidates
+
+	def get_step_count(self):
+		return len(self.history) if self.history is not None else 0
+
+	# Shows the grid and candidates of a previous step (used by the GUI to navigate through the steps).
+	def load_step(self, step):
+		(grid, self.candidates) = self.get_step(step)
+
+		self.values = bytearray(square.n for row in grid for square in row)
+		self.row_masks, self.column_masks, self.box_masks = unit_masks(self.get_grid_values(), self.box_size)
+		self.index_candidates()
+
+	def notify(self, callback):
+		if callback is not None:
+			callback()
+
+	def reset_gui_settings(self):
+		self.pause_between_steps = True
+		self.update_gui = True
+		self.should_reset_gui_settings = False
+
+	def reset_gui_settings_later(self):
+		self.should_reset_gui_settings = True
+
+	def set_square(self, pos, n):
+		if n != 0 and digit_bit(n) & ~self.free_digits_mask(pos[0], pos[1]):
+			raise ContradictionError(pos, n)
+
+		self.values[pos[0] * self.grid_size + pos[1]] = n
+
+		self.dirty[1] |= self.units.square_units_mask[pos[0]][pos[1]]
+		self.dirty[2] |= self.units.square_unit_digits_mask[pos[0]][pos[1]]
+		self.candidates_changed(pos)
+
+		if n != 0:
+			bit = digit_bit(n)
+			self.row_masks[pos[0]] |= bit
+			self.column_masks[pos[1]] |= bit
+			self.box_masks[box_index(pos[0], pos[1], self.box_size)] |= bit
+
+			# The number may now conflict with the empty squares of any unit containing one of the square's peers.
+			self.dirty[2] |= self.units.peer_unit_digits_mask[pos[0]][pos[1]] << (n - 1)
+
+			# The number can no longer go in any of the square's peers.
+			for candidate in self.candidates[pos[0]][pos[1]]:
+				self.unindex_candidate(pos, candidate)
+			self.candidates[pos[0]][pos[1]] = set()
+
+			for (i, j) in self.peers[pos[0]][pos[1]]:
+				if n in self.candidates[i][j]:
+					self.remove_candidate((i, j), n)
+
+	def remove_candidate(self, pos, n):
+		self.candidates[pos[0]][pos[1]].remove(n)
+		self.unindex_candidate(pos, n)
+
+	# Removes the square from the positions of the digit in the square's row, column and box.
+	def unindex_candidate(self, pos, n):
+		for unit_index, index in zip(self.units.square_units[pos[0]][pos[1]], self.units.square_unit_indices[pos[0]][pos[1]]):
+			self.digit_positions[unit_index][n - 1] &= ~(1 << index)
+
+		# The fish strategies only need to check the digits whose positions changed.
+		digit_mask = 1 << (n - 1)
+		self.dirty[7] |= digit_mask
+		self.dirty[8] |= digit_mask
+		self.dirty[9] |= digit_mask
+
+		self.eliminations += 1
+		self.candidates_changed(pos)
+
+	# Marks the units that the strategies using candidates need to check again after the square's candidates changed.
+	def candidates_changed(self, pos):
+		self.dirty[3] |= 1 << (pos[0] * self.grid_size + pos[1])
+		self.dirty[4] |= self.units.overlap_units_mask[pos[0]][pos[1]]
+		self.dirty[5] |= self.units.square_units_mask[pos[0]][pos[1]]
+		self.dirty[6] |= self.units.square_units_mask[pos[0]][pos[1]]
+		self.dirty[10] = 1
+		self.dirty[11] = 1
+
+	# Rebuilds the positions of each digit in each unit from the candidates.
+	def index_candidates(self):
+		self.digit_positions = []
+		for unit in self.units.all_units:
+			positions = [0] * self.grid_size
+			for index, (i, j) in enumerate(unit):
+				for n in self.candidates[i][j]:
+					positions[n - 1] |= 1 << index
+
+			self.digit_positions.append(positions)
+
+		# Every strategy needs to check the whole grid again.
+		self.mark_all_dirty()
+
+	def mark_all_dirty(self):
+		all_squares_mask = (1 << self.grid_size ** 2) - 1
+		self.dirty = [0] + [self.units.all_units_mask] * strategy_count
+		self.dirty[2] = self.units.all_unit_digits_mask
+		self.dirty[3] = all_squares_mask
+		self.dirty[7] = self.dirty[8] = self.dirty[9] = full_mask(self.grid_size)
+		self.dirty[10] = self.dirty[11] = 1
+
+	# Yields the units (or squares) the strategy still needs to check in order, marking each one as checked.
+	# Parts marked again while the strategy runs are left for its next call. The indices are found one at a time,
+	# since most strategies stop at their first deduction.
+	def scheduled(self, difficulty):
+		pending = self.dirty[difficulty]
+		while pending:
+			lowest_bit = pending & -pending
+			pending ^= lowest_bit
+
+			self.dirty[difficulty] &= ~lowest_bit
+			self.scans[difficulty] += 1
+
+			yield lowest_bit.bit_length() - 1
+
+	# Returns a mask of the digits already placed in a unit, by its index in units.all_units.
+	def placed_digits_mask(self, unit_index):
+		if unit_index < self.grid_size:
+			return self.row_masks[unit_index]
+		if unit_index < 2 * self.grid_size:
+			return self.column_masks[unit_index - self.grid_size]
+
+		return self.box_masks[unit_index - 2 * self.grid_size]
+
+	# Returns a mask of the digits that are not yet used in the square's row, column and box.
+	def free_digits_mask(self, row_index, column_index):
+		used = self.row_masks[row_index] | self.column_masks[column_index] | \
+			self.box_masks[box_index(row_index, column_index, self.box_size)]
+
+		return full_mask(self.grid_size) & ~used
+
+	# Returns a tuple of coordinates for all squares in the row.
+	# Indexed by [X; Y]
+	# X: row index; Y: column index
+	def get_coordinates_by_row(self, i):
+		return self.units.rows[i]
+
+	def get_coordinates_by_column(self, i):
+		return self.units.columns[i]
+
+	def get_coordinates_by_box(self, i):
+		return self.units.boxes[i]
+
+	# The grid as rows of Square objects, created from the values each time.
+	# Only the GUI and the explanations use Square objects, the solver works on the values directly.
+	@property
+	def grid(self):
+		return [[Square([i, j], self.values[i * self.grid_size + j]) for j in range(self.grid_size)] for i in range(self.grid_size)]
+
+	# Returns the numbers of each row of the grid.
+	def get_grid_values(self):
+		return [list(self.values[i * self.grid_size:(i + 1) * self.grid_size]) for i in range(self.grid_size)]
+
+	# Returns the squares of a unit, by its index in units.all_units, as Square objects.
+	def get_sequence(self, unit_index):
+		return [Square([index // self.grid_size, index % self.grid_size], self.values[index])
+				for index in self.units.all_unit_indices[unit_index]]
+
+	# Returns the numbers in a unit, by its index in units.all_units.
+	def unit_values(self, unit_index):
+		return [self.values[index] for index in self.units.all_unit_indices[unit_index]]
+
+	# Returns the positions of the empty squares of a unit.
+	def empty_positions(self, unit_index):
+		return [[index // self.grid_size, index % self.grid_size]
+				for index in self.units.all_unit_indices[unit_index] if self.values[index] == 0]
+
+	def get_row(self, i):
+		return self.get_sequence(i)
+
+	def get_column(self, i):
+		return self.get_sequence(self.grid_size + i)
+
+	# boxs are indexed left to right, and top to bottom.
+	def get_box(self, i):
+		return self.get_sequence(2 * self.grid_size + i)
+
+	def get_rows(self):
+		return [self.get_row(i) for i in range(self.grid_size)]
+
+	def get_columns(self):
+		return [self.get_column(i) for i in range(self.grid_size)]
+
+	def get_boxs(self):
+		return [self.get_box(i) for i in range(self.grid_size)]
+
+	# Returns a list of all rows, columns and boxs.
+	# Each item is a row/column/box, and contains a sequence of squares.
+	def get_all_sequences(self):
+		return [self.get_sequence(unit_index) for unit_index in range(len(self.units.all_units))]
+
+	# Checks whether any row/column/box contains two or more of the same number, except for 0.
+	# While solving, set_square keeps the grid valid, so this full check only runs after each step in debug mode.
+	def is_valid(self):
+		for unit_index in range(len(self.units.all_units)):
+			values = self.unit_values(unit_index)
+			if any(values.count(n) > 1 for n in self.all_possible_numbers):
+				return False
+
+		return True
+
+	# Checks the same thing as is_valid using the unit masks, by comparing the number of filled squares in each unit
+	# with the number of different digits placed in it. This is used to check the puzzle before solving it.
+	def masks_are_valid(self):
+		for unit_index, unit in enumerate(self.units.all_unit_indices):
+			filled_squares = sum(1 for index in unit if self.values[index] != 0)
+
+			if mask_size(self.placed_digits_mask(unit_index)) != filled_squares:
+				return False
+
+		return True
+
+	# Returns the number of solutions of the puzzle from its current candidates, counting at most `limit` of them
+	# (see solution_count.py). This doesn't change the grid.
+	def count_solutions(self, limit=2):
+		masks = [digits_mask(candidates) for row in self.candidates for candidates in row]
+
+		return count_completions(self.values, masks, self.box_size, limit)
+
+	# Sets the names of the strategies to try on each step, in order (see strategy_order).
+	def set_strategy_order(self, names):
+		for name in names:
+			if name not in strategies:
+				raise ValueError(f"Unknown strategy: {name}")
+
+		self.strategy_order = list(names)
+
+	def enable_strategy(self, name):
+		if name not in strategies:
+			raise ValueError(f"Unknown strategy: {name}")
+
+		self.disabled_strategies.discard(name)
+
+	def disable_strategy(self, name):
+		if name not in strategies:
+			raise ValueError(f"Unknown strategy: {name}")
+
+		self.disabled_strategies.add(name)
+
+	# Returns the strategies to try on each step, in order.
+	def active_strategies(self):
+		names = self.strategy_order if self.strategy_order is not None else strategies
+
+		return [strategies[name] for name in names if name not in self.disabled_strategies and
+				(self.use_search or strategies[name].difficulty < search_difficulty) and
+				(self.difficulty_limit is None or strategies[name].difficulty <= self.difficulty_limit)]
+
+	# Returns what each strategy did while solving the puzzle, as a dict of counters for each strategy name.
+	def get_strategy_stats(self):
+		return {name: stats.to_dict() for name, stats in self.strategy_stats.items()}
+
+	def export_strategy_stats(self, file):
+		json.dump(self.get_strategy_stats(), file, indent=2)
+
+	def start_solve(self):
+		try:
+			self.is_solved = self.solve()
+		except ContradictionError as error:
+			self.logger.error("Error occurred while solving: %s", error)
+			self.is_solved = False
+
+		if self.is_solved:
+			self.current_step += 1
+
+			if self.record_history:
+				self.record_step()
+				self.explanations.append(Explanation(f"Puzzle is solved. (Max difficulty: {self.max_difficulty})"))
+
+		elif self.record_history:
+			self.explanations.append(Explanation(
+				f"Couldn't solve the puzzle. (Max difficulty: {self.max_difficulty})",
+				candidates=self.candidates)
+			)
+
+		self.notify(self.on_step_done)
+		self.notify(self.on_finished)
+
+		# When we're done solving reset GUI settings to the default.
+		self.reset_gui_settings()
+
+	def solve(self):
+		self.total_steps = 0
+
+		if not self.masks_are_valid():
+			self.logger.error("The puzzle contains the same number twice in a row, column or box.")
+			return False
+
+		active_strategies = self.active_strategies()
+		for strategy in active_strategies:
+			self.strategy_stats.setdefault(strategy.name, StrategyStats())
+
+		while 0 in self.values:
+			if self.stop_square is not None and self.values[self.stop_square] != 0:
+				return False
+
+			self.total_steps += 1
+			if self.total_steps >= max_tries:
+				self.solve_failed = True
+				return False
+
+			if self.logger.isEnabledFor(logging.DEBUG):
+				self.logger.debug(format_grid(self.get_grid_values()))
+
+			self.current_step += 1
+
+			if self.record_history:
+				self.record_step()
+
+			if not self.fast:
+				self.wait_between_steps()
+
+			if not self.schedule_strategies:
+				self.mark_all_dirty()
+
+			if self.debug and not self.is_valid():
+				self.logger.error("Error occurred while solving.")
+				return False
+
+			if not self.try_strategies(active_strategies):
+				self.solve_failed = True
+				return False
+
+		if self.logger.isEnabledFor(logging.DEBUG):
+			self.logger.debug(format_grid(self.get_grid_values()))
+
+		return True
+
+	# Tries the strategies in order until one of them finds something, and completes the step with its difficulty.
+	# Returns False if none of them did.
+	def try_strategies(self, active_strategies):
+		candidates_saved = False
+		for strategy in active_strategies:
+			# Backup the candidates grid to use for explanations.
+			if strategy.uses_step_candidates and self.record_history and not candidates_saved:
+				self.notes["Candidates"] = [[candidates.copy() for candidates in row] for row in self.candidates]
+				candidates_saved = True
+
+			stats = self.strategy_stats[strategy.name]
+			eliminations = self.eliminations
+			start_time = time.perf_counter()
+
+			found = strategy.function(self)
+
+			stats.time += time.perf_counter() - start_time
+			stats.calls += 1
+			stats.eliminations += self.eliminations - eliminations
+
+			if found:
+				stats.successes += 1
+				self.complete_step(strategy.difficulty)
+				return True
+
+		return False
+
+	# Reports the step to the GUI, then waits for the configured time and for any pause to end.
+	def wait_between_steps(self):
+		if self.update_gui:
+			self.notify(self.on_step_done)
+
+		if self.pause_between_steps and self.total_steps > 1:
+			time.sleep(time_between_steps)
+
+		if self.should_reset_gui_settings:
+			self.reset_gui_settings()
+
+		# Wait for an unpause command.
+		while self.paused:
+			time.sleep(0.01)
+
+	def complete_step(self, difficulty):
+		self.max_difficulty = max(self.max_difficulty, difficulty)
+		self.logger.debug("Difficulty: %s", difficulty)
+
+		# Combine the explanations of all deductions made in this step, which start after the explanation
+		# of each previous step and the one for loading the puzzle. Each one is kept as a part, for its visuals.
+		if self.batch and self.record_history and len(self.explanations) > self.current_step + 1:
+			parts = self.explanations[self.current_step:]
+			self.explanations[self.current_step:] = [
+				Explanation("\n".join(part.text for part in parts), parts=parts)]
+
+	def fill_single_empty_squares(self):
+		found = False
+		for unit_index in self.scheduled(1):
+			unit_values = self.unit_values(unit_index)
+			i = missing_single_index(unit_values)
+
+			if i != -1:
+				pos = list(self.units.all_units[unit_index][i])
+
+				n = self.first_missing_digit(unit_values)
+
+				# The explanation shows the sequence as it was before the square was filled.
+				if self.record_history:
+					sequence = self.get_sequence(unit_index)
+
+				self.set_square(pos, n)
+
+				if self.record_history:
+					self.explanations.append(Explanation(
+						f"Only {n} is missing in this sequence.",
+						pos, sequence))
+
+				self.deductions += 1
+				if not self.batch:
+					return True
+				found = True
+
+		return found
+
+	def first_missing_digit(self, squares):
+		missing_digit = 0
+		for digit in self.all_possible_numbers:
+			if digit not in squares:
+				missing_digit = digit
+				break
+
+		return missing_digit
+
+	def missing_digits(self, squares):
+		missing_digits = []
+		for digit in self.all_possible_numbers:
+			if digit not in squares:
+				missing_digits.append(digit)
+
+		return missing_digits
+
+	# Returns the positions of the squares of a unit that contain n.
+	def find_in_unit(self, unit_index, n):
+		return [[index // self.grid_size, index % self.grid_size]
+				for index in self.units.all_unit_indices[unit_index] if self.values[index] == n]
+
+	def conflicts(self, row_index, column_index, n, return_early=False):
+		size = self.box_size
+
+		in_same_row = self.find_in_unit(row_index, n)
+
+		if len(in_same_row) > 0 and return_early:
+			return in_same_row
+
+		in_same_column = self.find_in_unit(self.grid_size + column_index, n)
+
+		if len(in_same_column) > 0 and return_early:
+			return in_same_column
+
+		box_index = (row_index // size)*size + (column_index // size)
+		in_same_box = self.find_in_unit(2 * self.grid_size + box_index, n)
+
+		if len(in_same_box) > 0 and return_early:
+			return in_same_box
+
+		return in_same_row + in_same_column + in_same_box
+
+	def could_contain(self, row_index, column_index, n):
+		return len(self.conflicts(row_index, column_index, n, return_early=True)) == 0
+
+	# Returns the only empty square of a unit where n could go, or None if there are none or several (see
+	# single_position, which count_completions also uses for hidden singles). This is the same as checking
+	# free_digits_mask for each empty square, but is called very often by fill_single_possible_squares, so the masks
+	# are read directly.
+	def single_possible_square(self, unit_index, n):
+		(row_masks, column_masks, box_masks) = (self.row_masks, self.column_masks, self.box_masks)
+		values = self.values
+		squares = self.units.all_unit_squares[unit_index]
+
+		position = single_position((0 if values[index] != 0 else ~(row_masks[i] | column_masks[j] | box_masks[box])
+									for (index, i, j, box) in squares), digit_bit(n))
+		if position == -1:
+			return None
+
+		(_, i, j, _) = squares[position]
+		return [i, j]
+
+	# Returns the squares already containing n that prevent it from going in each other empty square of a unit,
+	# as a list of (conflicting squares, empty square).
+	def unit_conflicts(self, unit_index, n):
+		conflicts = []
+		for pos in self.empty_positions(unit_index):
+			new_conflicts = self.conflicts(pos[0], pos[1], n)
+
+			if len(new_conflicts) > 0:
+				conflicts.append((new_conflicts, pos))
+
+		return conflicts
+
+	def fill_single_possible_squares(self):
+		found = False
+		for index in self.scheduled(2):
+			unit_index = index // self.grid_size
+			n = index % self.grid_size + 1
+
+			# Only digits that are missing from the unit are checked.
+			if self.placed_digits_mask(unit_index) & digit_bit(n):
+				continue
+
+			pos = self.single_possible_square(unit_index, n)
+
+			if pos is not None:
+
+				if self.record_history:
+					sequence = self.get_sequence(unit_index)
+					conflicts = self.unit_conflicts(unit_index, n)
+
+				self.set_square(pos, n)
+
+				if self.record_history:
+					self.explanations.append(Explanation(
+						f"There is only one square in the sequence where {n} could go.", pos, sequence,
+						circled_squares=[conflicting_square for conflict in conflicts for conflicting_square in conflict[0]],
+						crossed_lines=[[conflicting_square, conflict[1]] for conflict in conflicts for conflicting_square in conflict[0]],
+						crossed_squares=[conflict[1] for conflict in conflicts]
+					))
+
+				self.deductions += 1
+				if not self.batch:
+					return True
+				found = True
+
+		return found
+
+	# Note: this function always stores the candidates in order from lowest to highest.
+	def compute_candidates(self):
+		rows = self.get_grid_values()
+
+		# The masks and candidates are kept up to date by set_square from now on.
+		self.row_masks, self.column_masks, self.box_masks = unit_masks(rows, self.box_size)
+		self.candidates = candidates_from_masks(rows, self.box_size, self.row_masks, self.column_masks, self.box_masks)
+		self.index_candidates()
+
+	def update_candidates(self):
+		for index, n in enumerate(self.values):
+			pos = [index // self.grid_size, index % self.grid_size]
+
+			# If the square was filled remove all candidates.
+			if n != 0:
+				self.candidates[pos[0]][pos[1]] = set()
+				continue
+
+			# Remove any candidates that could no longer go on the square.
+			free_digits = self.free_digits_mask(pos[0], pos[1])
+			for n in self.candidates[pos[0]][pos[1]].copy():
+				if not free_digits & digit_bit(n):
+					self.candidates[pos[0]][pos[1]].remove(n)
+
+		self.index_candidates()
+
+	def fill_squares_with_one_candidate(self):
+		found = False
+		for index in self.scheduled(3):
+			if self.values[index] != 0:
+				continue
+
+			pos = [index // self.grid_size, index % self.grid_size]
+			candidates = self.candidates[pos[0]][pos[1]]
+
+			if len(candidates) == 1:
+				n = list(candidates)[0]
+				self.set_square(pos, n)
+
+				if self.record_history:
+					circled_squares = []
+					for excluded_number in self.all_possible_numbers:
+						if excluded_number == n:
+							continue
+
+						circled_squares += self.conflicts(pos[0], pos[1], excluded_number)
+
+					self.explanations.append(Explanation(
+						f"{n} is the only number that could go in this square.", pos,
+						circled_squares=circled_squares
+					))
+
+				self.deductions += 1
+				if not self.batch:
+					return True
+				found = True
+
+		return found
+
+	# If box 1 has only two positions where the number 8 could be, both in
+	# the same row, no other squares in that row may contain an 8.
+	def remove_candidates_by_elimination(self):
+		found = False
+		for unit_index in self.scheduled(4):
+			for n in self.all_possible_numbers:
+				possible_mask = self.digit_positions[unit_index][n - 1]
+
+				# Skip digits with fewer than two possible squares.
+				if possible_mask & (possible_mask - 1) == 0:
+					continue
+
+				# Only a unit crossing this one can contain all the possible squares.
+				for (other_unit_index, shared_mask, other_shared_mask) in self.units.overlaps[unit_index]:
+					if possible_mask & ~shared_mask:
+						continue
+
+					eliminated_mask = self.digit_positions[other_unit_index][n - 1] & ~other_shared_mask
+					if eliminated_mask == 0:
+						continue
+
+					# Sequences with the same numbers compare equal, and are never used to eliminate from each other.
+					if self.unit_values(other_unit_index) == self.unit_values(unit_index):
+						continue
+
+					other_sequence_positions = self.units.all_units[other_unit_index]
+					affected_squares = [other_sequence_positions[index] for index in mask_indices(eliminated_mask)]
+					eliminations_count = len(affected_squares)
+
+					for pos in affected_squares:
+						self.remove_candidate(pos, n)
+
+					if self.record_history:
+						possible_squares = [self.units.all_units[unit_index][index] for index in mask_indices(possible_mask)]
+
+						candidates_shown = []
+						for i, row in enumerate(self.candidates):
+							new_row = []
+							for j, candidates in enumerate(row):
+								if (i, j) in other_sequence_positions:
+									# Show only the number being eliminated
+									if (i, j) in possible_squares:
+										new_row.append([n])
+									else:
+										new_row.append(list(candidates))
+								else:
+									new_row.append([])
+							candidates_shown.append(new_row)
+
+						red_candidates_shown = []
+						for i, row in enumerate(self.notes["Candidates"]):
+							new_row = []
+							for j, candidates in enumerate(row):
+								new_row.append([n] if (i, j) in affected_squares else [])
+							red_candidates_shown.append(new_row)
+
+						self.explanations.append(Explanation(
+							f"Removed {eliminations_count} candidates from elimination.",
+							affected_sequence=self.get_sequence(unit_index),
+							candidates=candidates_shown,
+							candidates_red=red_candidates_shown
+						))
+
+					self.deductions += 1
+					if not self.batch:
+						return True
+					found = True
+
+					# Move on to the next digit.
+					break
+
+		return found
+
+	# If multiple squares share the same candidates and there are as many squares in the group as there
+	# are total candidates involved, these numbers may not go in any other square in the sequence.
+	# This is true even if some squares in the group only have part of the set of candidates.
+	# For example, if [0, 0] and [0, 1] definitely contain either a 1 or a 2, no other squares in the first row
+	# can have a 1 or a 2. For this to be true, the number of squares affected must equal the amount of numbers used.
+	def create_groups_with_same_candidates(self):
+		found = False
+		for unit_index in self.scheduled(5):
+			if self.logger.isEnabledFor(logging.DEBUG):
+				self.logger.debug("%s", self.get_sequence(unit_index))
+
+			positions = self.empty_positions(unit_index)
+			for i, pos in enumerate(positions):
+				candidates = self.candidates[pos[0]][pos[1]]
+				if len(candidates) < 2:
+					continue
+
+				group = [pos]
+				group_candidates = candidates.copy()
+
+				# The first option is that this square is a superset of all the other squares in the group,
+				# so it has all of their candidates combined and possibly more.
+				# The superset of all the group's candidates must be formed first, before finding smaller subsets.
+				for other_pos in positions[i+1:]:
+					other_candidates = self.candidates[other_pos[0]][other_pos[1]]
+
+					if group_candidates <= other_candidates:
+						# Update the superset of all candidates in the group
+						group_candidates = other_candidates.copy()
+
+						group.append(other_pos)
+
+				# Another option is that this square contains some candidates from the other members of the group,
+				# and no others. In this case it would be a subset of the set of total candidates.
+				# To correctly identify these, group_candidates has to be populated first.
+				for other_pos in positions[i+1:]:
+					other_candidates = self.candidates[other_pos[0]][other_pos[1]]
+
+					if other_pos not in group and other_candidates <= group_candidates:
+						group.append(other_pos)
+
+				# If there's as many items in the group as there are total candidates involved,
+				# we've exhausted the locations these numbers could go in.
+				if len(group) == len(group_candidates):
+					# Stored as [square_pos][removed_candidates].
+					affected_squares = []
+					for other_pos in positions:
+						if other_pos in group:
+							continue
+
+						removed_candidates = []
+						for candidate in group_candidates:
+							if candidate in self.candidates[other_pos[0]][other_pos[1]]:
+								self.remove_candidate(other_pos, candidate)
+								removed_candidates.append(candidate)
+
+						if len(removed_candidates) > 0:
+							affected_squares.append([other_pos, removed_candidates])
+
+					if len(affected_squares) == 0:
+						continue
+
+					if self.record_history:
+						candidates_shown = [[[] for _ in range(self.grid_size)] for _ in range(self.grid_size)]
+						red_candidates_shown = [[[] for _ in range(self.grid_size)] for _ in range(self.grid_size)]
+
+						for other_pos in positions:
+							candidates_shown[other_pos[0]][other_pos[1]] = list(self.candidates[other_pos[0]][other_pos[1]])
+
+						for [other_pos, removed_candidates] in affected_squares:
+							red_candidates_shown[other_pos[0]][other_pos[1]] = removed_candidates
+
+						self.explanations.append(Explanation(
+							f"Removed candidates using candidate groups.", affected_sequence=self.get_sequence(unit_index),
+							candidates=candidates_shown, candidates_red=red_candidates_shown
+						))
+
+					self.deductions += 1
+					if not self.batch:
+						return True
+					found = True
+
+		return found
+
+	# If a set of numbers share the same possible squares, and the set is as big as the
+	# amount of squares involved, we can assume those squares may not contain other numbers.
+	def create_disjoint_subsets(self):
+		found = False
+		for unit_index in self.scheduled(6):
+			positions = self.empty_positions(unit_index)
+			masks = [digits_mask(self.candidates[pos[0]][pos[1]]) for pos in positions]
+			# Note: a square cannot be part of multiple subsets as there wouldn't be enough room for all the numbers.
+			for i, pos in enumerate(positions):
+				candidates = self.candidates[pos[0]][pos[1]]
+				if len(candidates) < 2:
+					continue
+
+				subset = [pos]
+				subset_candidates = []
+
+				# Attempt an intersection with combinations of the other empty squares.
+				# If any of the intersections has as many candidates as its size, it will be selected as a disjoint subset.
+				# If there's as many squares in the subset as there are shared candidates, it's certain* that
+				# all squares involved will contain one of these numbers, so other candidates can be removed.
+				# *there needs to be one last verification step to make sure those numbers couldn't go anywhere else.
+				other_squares = positions.copy()
+				other_squares.remove(pos)
+				selection = first_disjoint_subset(masks[i], masks[:i] + masks[i+1:])
+
+				# Any given square can only be part of at most 1 disjoint subset,
+				# so there's no need to try other combinations.
+				if selection != 0:
+					subset += [other_squares[j] for j in range(len(other_squares)) if (1 << j) & selection]
+					subset_candidates = set.intersection(*[self.candidates[other_pos[0]][other_pos[1]] for other_pos in subset])
+
+				# If a valid subset was found, remove all other candidates from the squares involved.
+				if len(subset) > 1:
+					verification_failed = False
+					# First verify that the candidates in the subset cannot be placed anywhere else in the sequence.
+					for other_pos in positions:
+						if other_pos not in subset:
+							if self.candidates[other_pos[0]][other_pos[1]] & subset_candidates:
+								verification_failed = True
+								break
+
+					if verification_failed:
+						continue
+
+					eliminations = 0
+
+					if self.record_history:
+						candidates_shown = [[[] for _ in range(self.grid_size)] for _ in range(self.grid_size)]
+						red_candidates_shown = [[[] for _ in range(self.grid_size)] for _ in range(self.grid_size)]
+
+					# Note: the excess candidates are also removed from the current square, included in subset.
+					for other_pos in subset:
+						eliminations += len(self.candidates[other_pos[0]][other_pos[1]] - subset_candidates)
+
+						if self.record_history:
+							candidates_shown[other_pos[0]][other_pos[1]] = list(subset_candidates)
+							red_candidates_shown[other_pos[0]][other_pos[1]] = list(
+								self.candidates[other_pos[0]][other_pos[1]] - subset_candidates)
+
+						# Remove other candidates from the square.
+						for candidate in self.candidates[other_pos[0]][other_pos[1]] - subset_candidates:
+							self.unindex_candidate(other_pos, candidate)
+						self.candidates[other_pos[0]][other_pos[1]] = subset_candidates.copy()
+
+					# Don't complete the step if no candidates were removed.
+					if eliminations == 0:
+						continue
+
+					if self.record_history:
+						self.explanations.append(Explanation(
+							f"Removed candidates using disjoint subsets.", affected_sequence=self.get_sequence(unit_index),
+							candidates=candidates_shown, candidates_red=red_candidates_shown
+						))
+
+					self.deductions += 1
+					if not self.batch:
+						return True
+					found = True
+
+					# The candidate masks of the sequence are out of date, so move on to the next sequence.
+					break
+
+		return found
+
+	# Fish: if a digit can only go in the same `size` columns in each of `size` rows, each of these columns has the
+	# digit in one of these rows, so it can be removed from the other squares of the columns. The same goes with rows
+	# and columns swapped. This is an X-Wing with 2 rows, a Swordfish with 3 and a Jellyfish with 4.
+	# digit_positions gives the positions of a digit in a row as a mask of columns, and in a column as a mask of rows,
+	# so the rows (or columns) are combined as masks (see fish_patterns).
+	def remove_candidates_with_fish(self, size, difficulty):
+		found = False
+		grid_size = self.grid_size
+		for digit_index in self.scheduled(difficulty):
+			n = digit_index + 1
+
+			# The offsets of the base lines and of the lines crossing them in units.all_units.
+			for (base_offset, cover_offset) in [(0, grid_size), (grid_size, 0)]:
+				lines = []
+				for line in range(grid_size):
+					positions = self.digit_positions[base_offset + line][digit_index]
+					if 2 <= mask_size(positions) <= size:
+						lines.append((line, positions))
+
+				for (base_mask, cover_mask) in fish_patterns(lines, size):
+					affected_squares = []
+					for cover_line in mask_indices(cover_mask):
+						unit = self.units.all_units[cover_offset + cover_line]
+						eliminated_mask = self.digit_positions[cover_offset + cover_line][digit_index] & ~base_mask
+						affected_squares += [unit[index] for index in mask_indices(eliminated_mask)]
+
+					if len(affected_squares) == 0:
+						continue
+
+					if self.record_history:
+						candidates_shown = [[[] for _ in range(grid_size)] for _ in range(grid_size)]
+						red_candidates_shown = [[[] for _ in range(grid_size)] for _ in range(grid_size)]
+
+						for base_line in mask_indices(base_mask):
+							unit = self.units.all_units[base_offset + base_line]
+							for index in mask_indices(self.digit_positions[base_offset + base_line][digit_index]):
+								candidates_shown[unit[index][0]][unit[index][1]] = [n]
+
+						for pos in affected_squares:
+							red_candidates_shown[pos[0]][pos[1]] = [n]
+
+					for pos in affected_squares:
+						self.remove_candidate(pos, n)
+
+					if self.record_history:
+						self.explanations.append(Explanation(
+							f"Removed {len(affected_squares)} candidates using {fish_names[size]} of {n}.",
+							candidates=candidates_shown, candidates_red=red_candidates_shown
+						))
+
+					self.deductions += 1
+					if not self.batch:
+						return True
+					found = True
+
+					# The positions of the digit changed, so move on to the next digit.
+					break
+				else:
+					continue
+
+				break
+
+		return found
+
+	def remove_candidates_with_x_wings(self):
+		return self.remove_candidates_with_fish(2, 7)
+
+	def remove_candidates_with_swordfish(self):
+		return self.remove_candidates_with_fish(3, 8)
+
+	def remove_candidates_with_jellyfish(self):
+		return self.remove_candidates_with_fish(4, 9)
+
+	# XY-Wing: a square with two candidates x and y (the pivot) sees a square with x and z and a square with y and z
+	# (the pincers). Whichever of x and y goes in the pivot, one of the pincers is z, so z can be removed from the
+	# squares that see both pincers.
+	# XYZ-Wing: the pivot has x, y and z, and the pincers x and z, and y and z. The pivot can be z as well,
+	# so z can only be removed from the squares that see the pivot and both pincers.
+	def remove_candidates_with_wings(self, pivot_size, difficulty):
+		found = False
+		grid_size = self.grid_size
+		peer_indices = self.units.peer_indices
+		for _ in self.scheduled(difficulty):
+			masks = [digits_mask(candidates) for row in self.candidates for candidates in row]
+			bivalue_squares = {index for index, candidates in enumerate(masks) if mask_size(candidates) == 2}
+
+			for pivot in range(grid_size ** 2):
+				if mask_size(masks[pivot]) != pivot_size:
+					continue
+
+				pincers = [peer for peer in peer_indices[pivot] if peer in bivalue_squares]
+				for (first, second, z) in wing_pincers(masks, pivot, pincers, pivot_size):
+					seen = set(peer_indices[second])
+					if pivot_size == 3:
+						seen.intersection_update(peer_indices[pivot])
+
+					affected_indices = [index for index in peer_indices[first] if index in seen and masks[index] & z]
+					if len(affected_indices) == 0:
+						continue
+
+					affected_squares = [(index // grid_size, index % grid_size) for index in affected_indices]
+					n = z.bit_length()
+
+					if self.record_history:
+						candidates_shown = [[[] for _ in range(grid_size)] for _ in range(grid_size)]
+						red_candidates_shown = [[[] for _ in range(grid_size)] for _ in range(grid_size)]
+
+						for index in [pivot, first, second]:
+							candidates_shown[index // grid_size][index % grid_size] = mask_digits(masks[index])
+
+						for pos in affected_squares:
+							red_candidates_shown[pos[0]][pos[1]] = [n]
+
+					for (index, pos) in zip(affected_indices, affected_squares):
+						self.remove_candidate(pos, n)
+						masks[index] &= ~z
+
+					if self.record_history:
+						name = "an XY-Wing" if pivot_size == 2 else "an XYZ-Wing"
+						self.explanations.append(Explanation(
+							f"Removed {len(affected_squares)} candidates using {name}.",
+							candidates=candidates_shown, candidates_red=red_candidates_shown
+						))
+
+					self.deductions += 1
+					if not self.batch:
+						return True
+					found = True
+
+					# The candidates of the pincers may have changed, so move on to the next pivot.
+					break
+
+		return found
+
+	def remove_candidates_with_xy_wings(self):
+		return self.remove_candidates_with_wings(2, 10)
+
+	def remove_candidates_with_xyz_wings(self):
+		return self.remove_candidates_with_wings(3, 11)
+
+	# Searches for a solution starting from the current candidates, then fills the empty square with the
+	# fewest candidates using the number found by the search. The other strategies take over again afterwards.
+	def guess_from_search(self):
+		start_time = time.perf_counter()
+
+		masks = [digits_mask(candidates) for row in self.candidates for candidates in row]
+
+		(solutions, nodes) = search_solutions(self.values, masks, self.box_size)
+
+		self.search_nodes += nodes
+		self.search_time += time.perf_counter() - start_time
+
+		if len(solutions) == 0:
+			return False
+
+		positions = [[index // self.grid_size, index % self.grid_size] for index, n in enumerate(self.values) if n == 0]
+		pos = min(positions, key=lambda pos: len(self.candidates[pos[0]][pos[1]]))
+		n = solutions[0][pos[0] * self.grid_size + pos[1]]
+
+		if self.record_history:
+			candidates_shown = [[[] for _ in range(self.grid_size)] for _ in range(self.grid_size)]
+			candidates_shown[pos[0]][pos[1]] = list(self.candidates[pos[0]][pos[1]])
+
+		self.set_square(pos, n)
+
+		if self.record_history:
+			self.explanations.append(Explanation(
+				f"Guessed {n}: a search of {nodes} nodes found a solution with this number.", pos,
+				candidates=candidates_shown
+			))
+
+		self.deductions += 1
+
+		return True
+
+
+# Fill squares that are the only empty square in a row/column/box.
+register_strategy("fill_single_empty_squares", 1, Sudoku.fill_single_empty_squares)
+
+# Fill squares that are the only possible square where a digit could go in a row/column/box.
+register_strategy("fill_single_possible_squares", 2, Sudoku.fill_single_possible_squares)
+
+# Fill squares that have only one candidate number (all other numbers are already in the same row/column/box)
+register_strategy("fill_squares_with_one_candidate", 3, Sudoku.fill_squares_with_one_candidate)
+
+register_strategy("remove_candidates_by_elimination", 4, Sudoku.remove_candidates_by_elimination,
+				  uses_step_candidates=True)
+register_strategy("create_groups_with_same_candidates", 5, Sudoku.create_groups_with_same_candidates)
+register_strategy("create_disjoint_subsets", 6, Sudoku.create_disjoint_subsets)
+register_strategy("remove_candidates_with_x_wings", 7, Sudoku.remove_candidates_with_x_wings)
+register_strategy("remove_candidates_with_swordfish", 8, Sudoku.remove_candidates_with_swordfish)
+register_strategy("remove_candidates_with_jellyfish", 9, Sudoku.remove_candidates_with_jellyfish)
+register_strategy("remove_candidates_with_xy_wings", 10, Sudoku.remove_candidates_with_xy_wings)
+register_strategy("remove_candidates_with_xyz_wings", 11, Sudoku.remove_candidates_with_xyz_wings)
+register_strategy("guess_from_search", search_difficulty, Sudoku.guess_from_search)
+
+
+# The names of the fish strategies by size, as used in the explanations.
+fish_names = {2: "an X-Wing", 3: "a Swordfish", 4: "a Jellyfish"}
+
+
+# Yields each selection of `size` lines (rows or columns) where a digit can only go in `size` crossing lines,
+# as a mask of the selected lines and a mask of the crossing lines.
+# lines: the lines to select from, as (line index, mask of the crossing lines where the digit can go).
+# Adding a line never removes crossing lines, so a selection is only extended while it has at most `size` of them.
+def fish_patterns(lines, size, start=0, selected=0, covered=0, count=0):
+	if count == size:
+		if mask_size(covered) == size:
+			yield selected, covered
+
+		return
+
+	for k in range(start, len(lines) - (size - count) + 1):
+		(line, positions) = lines[k]
+		if mask_size(covered | positions) <= size:
+			yield from fish_patterns(lines, size, k + 1, selected | (1 << line), covered | positions, count + 1)
+
+
+# Yields the pincers of each wing with the given pivot (see Sudoku.remove_candidates_with_wings), as the indices of
+# the two pincers and the bit of the digit they share. The pincers of an XY-Wing share one digit with the pivot,
+# those of an XYZ-Wing share two, and together they have all the digits of the pivot.
+# masks: the candidates of each square, as masks.
+# squares: the peers of the pivot with two candidates.
+def wing_pincers(masks, pivot, squares, pivot_size):
+	pivot_mask = masks[pivot]
+	pincers = [square for square in squares if mask_size(masks[square] & pivot_mask) == pivot_size - 1]
+
+	for (k, first) in enumerate(pincers):
+		for second in pincers[k + 1:]:
+			if masks[first] == masks[second] or pivot_mask & ~(masks[first] | masks[second]):
+				continue
+
+			# The digit shared by the pincers, which for an XY-Wing can't be one of the pivot's digits.
+			z = masks[first] & masks[second]
+			if z != 0 and (pivot_size == 3 or not z & pivot_mask):
+				yield first, second, z
+
+
+def empty_squares(sequence):
+	empty_squares = []
+	for square in sequence:
+		if square.n == 0:
+			empty_squares.append(square.pos)
+	return empty_squares
+
+
+# Selects other squares (using a bitmask over other_masks) so that the candidates shared by the selected squares
+# and the first square are as many as the squares involved. Returns 0 if there is no such selection.
+# If there are multiple, returns the one with the lowest bitmask, as if every bitmask was tried in order.
+# Adding a square never increases the number of shared candidates, so a combination is only extended
+# while it still has more shared candidates than squares.
+def first_disjoint_subset(first_mask, other_masks):
+	# Returns the lowest selection of squares with an index lower than `limit` that completes the subset.
+	def complete_subset(limit, shared, count):
+		shared_count = mask_size(shared)
+		if shared_count == count:
+			return 0
+
+		if shared_count < count:
+			return None
+
+		# Selections with a lower highest index are always lower.
+		for j in range(limit):
+			selection = complete_subset(j, shared & other_masks[j], count + 1)
+			if selection is not None:
+				return selection | (1 << j)
+
+		return None
+
+	for j in range(len(other_masks)):
+		selection = complete_subset(j, first_mask & other_masks[j], 2)
+		if selection is not None:
+			return selection | (1 << j)
+
+	return 0
+
+
+def missing_single_index(values):
+	missing_single_index = -1
+	empty_count = 0
+	for i, n in enumerate(values):
+		if n == 0:
+			empty_count += 1
+			missing_single_index = i
+
+		if empty_count > 1:
+			return -1
+
+	return missing_single_index if empty_count == 1 else -1
+
+
+def format_grid(grid):
+	max_number = max(max(row) for row in grid)
+	max_number_length = len(str(max_number))
+
+	lines = []
+	for row in grid:
+		line = ""
+		for square in row:
+			number_length = len(str(square))
+			line += " " * ((max_number_length - number_length) + extra_spaces)
+
+			line += str(square) + " "
+
+		lines.append(line)
+
+	return "\n".join(lines) + "\n"
+
+
+# Solves the puzzle in fast mode, and returns the Sudoku object
+# so that the caller can inspect the final grid, the explanations and the statistics.
+# An existing Sudoku object can be passed to be reused instead of creating a new one.
+# Without record_history, the steps and their explanations are not recorded, which is faster.
+# With batch, each step applies all deductions its strategy can find (see Sudoku.batch).
+def solve(grid, box_size, use_search=False, sudoku=None, record_history=True, batch=False):
+	if sudoku is None:
+		sudoku = Sudoku(grid, box_size, record_history)
+	else:
+		sudoku.record_history = record_history
+		sudoku.load(grid, box_size)
+
+	sudoku.fast = True
+	sudoku.use_search = use_search
+	sudoku.batch = batch
+
+	sudoku.start_solve()
+
+	return sudoku
+
@@ -0,0 +1,135 @@
+# Tables describing which squares belong to each row, column and box (the units of the grid).
+# They only depend on the box size, so they are built once per box size and shared by every puzzle.
+# Positions are stored as (row, column) tuples, and all tables are tuples so that they can't be modified.
+from functools import lru_cache
+
+from bitmasks import box_index
+
+
+class Units:
+	def __init__(self, box_size):
+		size = box_size
+		grid_size = box_size ** 2
+
+		self.box_size = box_size
+		self.grid_size = grid_size
+
+		self.rows = tuple(tuple((i, j) for j in range(grid_size)) for i in range(grid_size))
+		self.columns = tuple(tuple((j, i) for j in range(grid_size)) for i in range(grid_size))
+
+		# Boxes are indexed left to right, and top to bottom.
+		self.boxes = tuple(
+			tuple(((i // size) * size + j, (i % size) * size + k) for j in range(size) for k in range(size))
+			for i in range(grid_size))
+
+		# All rows, then all columns, then all boxes.
+		self.all_units = self.rows + self.columns + self.boxes
+
+		# The same units, with each square indexed by row * grid_size + column.
+		self.all_unit_indices = tuple(tuple(i * grid_size + j for (i, j) in unit) for unit in self.all_units)
+
+		# The same units, with each square as (index, row, column, box), to read the masks of its units directly.
+		self.all_unit_squares = tuple(tuple((i * grid_size + j, i, j, box_index(i, j, size)) for (i, j) in unit)
+									  for unit in self.all_units)
+
+		# For each square, indexed by [row][column], the index in all_units of its row, column and box,
+		# and the index of the square inside each of them.
+		self.square_units = tuple(
+			tuple((i, grid_size + j, 2 * grid_size + box_index(i, j, size)) for j in range(grid_size))
+			for i in range(grid_size))
+		self.square_unit_indices = tuple(
+			tuple((j, i, (i % size) * size + j % size) for j in range(grid_size))
+			for i in range(grid_size))
+
+		# For each unit, the other units sharing at least two of its squares (the boxes crossing a row or column,
+		# and the rows and columns crossing a box), in the same order as all_units. Each item holds the index of
+		# the other unit, and masks of the shared squares, by their index in the unit and in the other unit.
+		self.overlaps = tuple(self.get_overlaps(unit) for unit in self.all_units)
+
+		# For each square, the positions of all other squares in the same row, column or box.
+		self.peers = tuple(tuple(self.get_peers(i, j) for j in range(grid_size)) for i in range(grid_size))
+
+		# The same peers, with squares indexed by row * grid_size + column, in a flat tuple indexed the same way.
+		self.peer_indices = tuple(tuple(p * grid_size + q for (p, q) in self.peers[i][j])
+								  for i in range(grid_size) for j in range(grid_size))
+
+		# Masks of units, where bit i stands for all_units[i], used to track which units need to be checked again
+		# by each strategy when a square changes. For each square:
+		# - square_units_mask: its row, column and box.
+		# - peer_units_mask: every unit containing the square or one of its peers.
+		# - overlap_units_mask: its row, column and box, and every unit crossing them in two or more squares.
+		self.all_units_mask = (1 << len(self.all_units)) - 1
+		self.square_units_mask = tuple(
+			tuple(sum(1 << unit_index for unit_index in self.square_units[i][j]) for j in range(grid_size))
+			for i in range(grid_size))
+		self.peer_units_mask = tuple(
+			tuple(self.get_units_mask(self.peers[i][j] + ((i, j),)) for j in range(grid_size))
+			for i in range(grid_size))
+		self.overlap_units_mask = tuple(
+			tuple(self.get_overlap_units_mask(i, j) for j in range(grid_size))
+			for i in range(grid_size))
+
+		# Masks of pairs of a unit and a digit, where bit u * grid_size + (n - 1) stands for the digit n in
+		# all_units[u]. For each square:
+		# - square_unit_digits_mask: every digit in its row, column and box.
+		# - peer_unit_digits_mask: the digit 1 in every unit containing the square or one of its peers.
+		#   Shifting it left by (n - 1) gives the same units for the digit n.
+		self.all_unit_digits_mask = (1 << (len(self.all_units) * grid_size)) - 1
+		self.square_unit_digits_mask = tuple(
+			tuple(self.get_unit_digits_mask(self.square_units_mask[i][j], (1 << grid_size) - 1) for j in range(grid_size))
+			for i in range(grid_size))
+		self.peer_unit_digits_mask = tuple(
+			tuple(self.get_unit_digits_mask(self.peer_units_mask[i][j], 1) for j in range(grid_size))
+			for i in range(grid_size))
+
+	def get_overlaps(self, unit):
+		overlaps = []
+		for other_unit_index, other_unit in enumerate(self.all_units):
+			shared = [pos for pos in unit if pos in other_unit]
+			if other_unit == unit or len(shared) < 2:
+				continue
+
+			mask = sum(1 << unit.index(pos) for pos in shared)
+			other_mask = sum(1 << other_unit.index(pos) for pos in shared)
+			overlaps.append((other_unit_index, mask, other_mask))
+
+		return tuple(overlaps)
+
+	# Returns the mask of all units containing any of the positions.
+	def get_units_mask(self, positions):
+		mask = 0
+		for (i, j) in positions:
+			mask |= self.square_units_mask[i][j]
+
+		return mask
+
+	def get_overlap_units_mask(self, row_index, column_index):
+		mask = self.square_units_mask[row_index][column_index]
+		for unit_index in self.square_units[row_index][column_index]:
+			for (other_unit_index, _, _) in self.overlaps[unit_index]:
+				mask |= 1 << other_unit_index
+
+		return mask
+
+	# Returns the mask of pairs of a unit and a digit for the digits of digits_mask in each unit of units_mask.
+	def get_unit_digits_mask(self, units_mask, digits_mask):
+		mask = 0
+		for unit_index in range(len(self.all_units)):
+			if units_mask & (1 << unit_index):
+				mask |= digits_mask << (unit_index * self.grid_size)
+
+		return mask
+
+	def get_peers(self, row_index, column_index):
+		peers = []
+		for unit_index in self.square_units[row_index][column_index]:
+			for pos in self.all_units[unit_index]:
+				if pos != (row_index, column_index) and pos not in peers:
+					peers.append(pos)
+
+		return tuple(peers)
+
+
+@lru_cache(maxsize=None)
+def get_units(box_size):
+	return Units(box_size)